@@ -0,0 +1,219 @@
+'''Performance regression gate comparing two benchmark result files of hotpaths.py'''
+import argparse
+import json
+import math
+import os
+import re
+import statistics
+import sys
+from itertools import combinations
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'evaluation'))
+
+from performance_indicators import hypervolume  # noqa: E402
+
+EXACT_LIMIT = 20000  # Maximum number of rank combinations of the exact test
+
+
+def get_ranks(values: list) -> list:
+    '''Ranks the values from 1, giving tied values the average of their ranks.'''
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def mann_whitney(x: list, y: list) -> float:
+    '''
+    One-sided Mann-Whitney U test of the values in `x` being greater than the values in `y`.
+    The p-value is exact (permutation distribution of the rank sum, with ties) for small
+    samples, and uses the normal approximation with tie correction otherwise.
+
+    Args:
+      x (list): values of the first sample.
+      y (list): values of the second sample.
+
+    Returns:
+      (float): p-value of the test, or None if a sample is empty.
+    '''
+    n1, n2 = len(x), len(y)
+    if n1 == 0 or n2 == 0:
+        return None
+    ranks = get_ranks(list(x) + list(y))
+    rank_sum = sum(ranks[:n1])
+
+    if math.comb(n1 + n2, n1) <= EXACT_LIMIT:
+        sums = [sum(c) for c in combinations(ranks, n1)]
+        return sum(1 for s in sums if s >= rank_sum - 1e-9) / len(sums)
+
+    n = n1 + n2
+    u = rank_sum - n1 * (n1 + 1) / 2
+    ties = sum(t ** 3 - t for t in (ranks.count(r) for r in set(ranks)))
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def get_family(instance: str) -> str:
+    '''Names the family of an instance, removing its size `_n<nodes>` and the rest of the name.'''
+    return re.sub(r'_n\d+.*$', '', instance)
+
+
+def compare_samples(metric: str, old: list, new: list, threshold: float, alpha: float,
+                    higher_is_better: bool = False) -> dict:
+    '''
+    Compares the samples of a metric of two benchmark runs. A change is a regression (or an
+    improvement) if the relative change of the median is worse (better) than the threshold and
+    it is statistically significant.
+
+    Args:
+      metric (str): name of the metric.
+      old (list): values of the baseline run.
+      new (list): values of the compared run.
+      threshold (float): minimum relative change of the median reported.
+      alpha (float): significance level of the Mann-Whitney U test.
+      higher_is_better (bool): if True, lower values are a regression (e.g. hypervolume).
+
+    Returns:
+      (dict): medians, relative change, p-values and status of the metric.
+    '''
+    old_median, new_median = statistics.median(old), statistics.median(new)
+    change = new_median / old_median - 1 if old_median else 0.0
+    p_worse = mann_whitney(old, new) if higher_is_better else mann_whitney(new, old)
+    p_better = mann_whitney(new, old) if higher_is_better else mann_whitney(old, new)
+    worse = -change if higher_is_better else change
+
+    status = ''
+    if worse > threshold and p_worse < alpha:
+        status = 'regression'
+    elif worse < -threshold and p_better < alpha:
+        status = 'improvement'
+
+    return {'metric': metric, 'old': old_median, 'new': new_median, 'change': change,
+            'p_value': min(p_worse, p_better), 'status': status}
+
+
+def compare(old: dict, new: dict, threshold: float, hv_threshold: float, alpha: float) -> list:
+    '''
+    Compares the time of each benchmark and GRASP phase, and the hypervolume of the GRASP fronts,
+    of the instances in both benchmark results.
+
+    Args:
+      old (dict): baseline benchmark results.
+      new (dict): compared benchmark results.
+      threshold (float): minimum relative change of the times reported.
+      hv_threshold (float): minimum relative change of the hypervolume reported.
+      alpha (float): significance level of the tests.
+
+    Returns:
+      (list): comparison of each instance and metric.
+    '''
+    rows = []
+    for instance in sorted(set(old['results']) & set(new['results'])):
+        old_results, new_results = old['results'][instance], new['results'][instance]
+        samples = []
+        for benchmark in old_results:
+            if benchmark in new_results:
+                samples.append((f'{benchmark}_time', old_results[benchmark]['times'],
+                                new_results[benchmark]['times'], threshold, False))
+        if 'grasp' in old_results and 'grasp' in new_results:
+            old_grasp, new_grasp = old_results['grasp'], new_results['grasp']
+            for phase in old_grasp['phases']:
+                if phase in new_grasp['phases']:
+                    samples.append((f'grasp_{phase}_time', old_grasp['phases'][phase],
+                                    new_grasp['phases'][phase], threshold, False))
+            samples.append(('grasp_hypervolume', [hypervolume(f) for f in old_grasp['fronts']],
+                            [hypervolume(f) for f in new_grasp['fronts']], hv_threshold, True))
+
+        for metric, old_values, new_values, metric_threshold, higher_is_better in samples:
+            row = compare_samples(metric, old_values, new_values, metric_threshold, alpha,
+                                  higher_is_better)
+            rows.append(dict(row, instance=instance, family=get_family(instance)))
+
+    return rows
+
+
+def summarize_families(rows: list) -> list:
+    '''
+    Summarizes the comparison of each metric in each instance family with the geometric mean of
+    the ratio between the new and old medians, and the number of regressions.
+
+    Args:
+      rows (list): comparison of each instance and metric.
+
+    Returns:
+      (list): family, metric, mean change, and number of instances and regressions.
+    '''
+    groups = {}
+    for row in rows:
+        groups.setdefault((row['family'], row['metric']), []).append(row)
+
+    summary = []
+    for (family, metric), group in sorted(groups.items()):
+        ratios = [1 + row['change'] for row in group if 1 + row['change'] > 0]
+        change = math.exp(statistics.mean([math.log(r) for r in ratios])) - 1 if ratios else 0
+        summary.append({'family': family, 'metric': metric, 'change': change,
+                        'instances': len(group),
+                        'regressions': sum(row['status'] == 'regression' for row in group)})
+    return summary
+
+
+def print_report(rows: list, summary: list, show_all: bool):
+    '''Prints the compared metrics (only the significant changes unless `show_all`) and the
+    summary of each family.'''
+    print(f'{"instance":<20} {"metric":<34} {"old":>10} {"new":>10} {"change":>8} '
+          f'{"p":>7}  status')
+    for row in rows:
+        if show_all or row['status']:
+            print(f'{row["instance"]:<20} {row["metric"]:<34} {row["old"]:>10.4g} '
+                  f'{row["new"]:>10.4g} {row["change"]:>+8.1%} {row["p_value"]:>7.3f}  '
+                  f'{row["status"]}')
+    print()
+    print(f'{"family":<20} {"metric":<34} {"change":>8} {"regressions":>12}')
+    for family in summary:
+        print(f'{family["family"]:<20} {family["metric"]:<34} {family["change"]:>+8.1%} '
+              f'{family["regressions"]:>7}/{family["instances"]}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compares two benchmark result files and fails '
+                                                 'if there are significant regressions')
+    parser.add_argument('old', help='baseline JSON file of hotpaths.py')
+    parser.add_argument('new', help='compared JSON file of hotpaths.py')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown of the median time reported as a regression')
+    parser.add_argument('--hv-threshold', type=float, default=0.01,
+                        help='relative loss of median hypervolume reported as a regression')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help='significance level of the Mann-Whitney U tests')
+    parser.add_argument('--all', action='store_true',
+                        help='print every metric, not only the significant changes')
+    parser.add_argument('--output', help='JSON file where the comparison is saved')
+    args = parser.parse_args()
+
+    with open(args.old, 'r') as file:
+        old = json.load(file)
+    with open(args.new, 'r') as file:
+        new = json.load(file)
+
+    rows = compare(old, new, args.threshold, args.hv_threshold, args.alpha)
+    summary = summarize_families(rows)
+    print_report(rows, summary, args.all)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'old': old['metadata'], 'new': new['metadata'], 'rows': rows,
+                       'families': summary}, file, indent=2)
+
+    n_regressions = sum(row['status'] == 'regression' for row in rows)
+    if n_regressions > 0:
+        print(f'\n{n_regressions} significant regressions.')
+        sys.exit(1)
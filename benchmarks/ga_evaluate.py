@@ -0,0 +1,148 @@
+'''Benchmark of the population evaluation of the pymoo problem of the GA algorithms'''
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from generator import write_instance
+
+SRC_GA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src_ga')
+sys.path.insert(0, SRC_GA_DIR)
+
+from bi_objective_generalized_diversity_problem import (  # noqa: E402
+    BiObjectiveGeneralizedDiversityProblem)
+from structure import instance  # noqa: E402
+from utils.evaluator import ParallelEvaluator  # noqa: E402
+
+
+def evaluate_loop(problem: BiObjectiveGeneralizedDiversityProblem, X: np.ndarray) -> dict:
+    '''
+    Evaluates a population with the previous loop over the individuals and their pairs of
+    selected elements, used as reference of the outputs and the time of the vectorized one.
+
+    Args:
+      problem (BiObjectiveGeneralizedDiversityProblem): problem of an instance.
+      X (np.ndarray): population, one boolean row per individual.
+
+    Returns:
+      (dict): objective values `F` and constraint violations `G` of the population.
+    '''
+    f1, f2, g1, g2 = [], [], [], []
+    for x in X:
+        selected = np.where(x == 1)[0]
+        if len(selected) > 1:
+            f1.append(-np.sum([problem.dist_matrix[i, j]
+                               for i in selected for j in selected if i < j]))
+            f2.append(-np.min([problem.dist_matrix[i, j]
+                               for i in selected for j in selected if i != j]))
+        else:
+            f1.append(float("inf"))
+            f2.append(float("inf"))
+        g1.append(np.sum(problem.costs[selected]) - problem.K)
+        g2.append(problem.B - np.sum(problem.capacities[selected]))
+
+    return {'F': np.column_stack([f1, f2]), 'G': np.column_stack([g1, g2])}
+
+
+def evaluate_vectorized(problem: BiObjectiveGeneralizedDiversityProblem, X: np.ndarray) -> dict:
+    '''Evaluates a population with the (array based) `_evaluate` method of the problem.'''
+    out = {}
+    problem._evaluate(X, out)
+    return out
+
+
+def run_size(n: int, pop_size: int, density: float, repeat: int, seed: int,
+             work_dir: str, memory_budget: int = None, workers: int = 1) -> dict:
+    '''
+    Measures the evaluation time of a random population of an instance with `n` nodes with both
+    implementations (and the parallel evaluator if `workers` > 1), and checks that their outputs
+    are identical.
+
+    Args:
+      n (int): number of nodes of the instance.
+      pop_size (int): number of individuals of the population.
+      density (float): probability of an element being selected in an individual.
+      repeat (int): number of evaluations measured.
+      seed (int): random seed of the instance and the population.
+      work_dir (str): directory where the instance is written.
+      memory_budget (int): bytes of each chunk of the vectorized evaluation (default of the
+    problem if None).
+      workers (int): number of processes of the parallel evaluator.
+
+    Returns:
+      (dict): median time of each implementation in seconds and speedup over the loop.
+    '''
+    path = os.path.join(work_dir, f'syn_coo_n{n}.txt')
+    write_instance(path, n, seed=seed)
+    inst = instance.read_instance(path)
+    problem = BiObjectiveGeneralizedDiversityProblem(np.array(inst['d']), np.array(inst['a']),
+                                                     np.array(inst['c']), inst['B'], inst['K'],
+                                                     memory_budget)
+    X = np.random.default_rng(seed).random((pop_size, n)) < density
+    X[0] = False  # Individuals without enough selected elements
+    X[1, 1:] = False
+
+    evaluations = [('loop', evaluate_loop), ('vectorized', evaluate_vectorized)]
+    evaluator = None
+    if workers > 1:
+        evaluator = ParallelEvaluator(workers, problem.dist_matrix, problem.costs,
+                                      problem.capacities, problem.B, problem.K, memory_budget)
+        evaluator.evaluate(X)  # The workers are started before measuring
+        evaluations.append(('parallel', lambda _, X: evaluator.evaluate(X)))
+
+    results = {}
+    outputs = {}
+    for name, evaluate in evaluations:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs[name] = evaluate(problem, X)
+            times.append(time.perf_counter() - start)
+        results[name] = statistics.median(times)
+    if evaluator is not None:
+        evaluator.close()
+
+    # The objective values and constraint violations must be identical, not only close
+    for name, _ in evaluations[1:]:
+        for key in ('F', 'G'):
+            if not np.array_equal(outputs['loop'][key], outputs[name][key]):
+                raise AssertionError(f'The {key} values of the {name} evaluation differ for '
+                                     f'n={n}.')
+        results[f'{name}_speedup'] = results['loop'] / results[name]
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Population evaluation of the GA problem')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500],
+                        help='number of nodes of the random instances')
+    parser.add_argument('--pop-size', type=int, default=100,
+                        help='number of individuals of the population')
+    parser.add_argument('--density', type=float, default=0.5,
+                        help='probability of an element being selected (0.5 as in the random '
+                             'sampling of the GA)')
+    parser.add_argument('--memory-budget', type=float,
+                        help='MB of each chunk of the vectorized evaluation (small values check '
+                             'that the chunked evaluation is identical)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='also measure the parallel evaluator with this number of processes')
+    parser.add_argument('--repeat', type=int, default=3, help='number of evaluations measured')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--output', help='JSON file where the results are saved')
+    args = parser.parse_args()
+
+    memory_budget = int(args.memory_budget * 2 ** 20) if args.memory_budget else None
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = {f'n{n}': run_size(n, args.pop_size, args.density, args.repeat, args.seed,
+                                     work_dir, memory_budget, args.workers)
+                   for n in args.sizes}
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
@@ -0,0 +1,119 @@
+'''Generator of synthetic GDP instances in the format read by `structure.instance`'''
+import argparse
+import math
+import os
+import random
+
+VARIANTS = ['coordinates', 'matrix']
+DISTRIBUTIONS = ['uniform', 'normal']
+
+
+def draw_values(rng: random.Random, n: int, low: int, high: int, distribution: str) -> list:
+    '''
+    Draws the integer costs or capacities of the nodes.
+
+    Args:
+      rng (random.Random): random generator.
+      n (int): number of nodes.
+      low (int): minimum value.
+      high (int): maximum value.
+      distribution (str): distribution of the values. {uniform, normal}. The normal
+    distribution is centered in the range, with a standard deviation of a sixth of it, and
+    clipped to the range.
+
+    Returns:
+      (list): value of each node.
+    '''
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{distribution}'.")
+
+    if distribution == 'uniform':
+        return [rng.randint(low, high) for _ in range(n)]
+    mean, sd = (low + high) / 2, (high - low) / 6
+    return [min(high, max(low, round(rng.gauss(mean, sd)))) for _ in range(n)]
+
+
+def write_instance(path: str, n: int, variant: str = 'coordinates', dimensions: int = 2,
+                   cost_range: tuple = (1, 20), capacity_range: tuple = (1, 20),
+                   distribution: str = 'uniform', cost_tightness: float = 0.3,
+                   capacity_tightness: float = 0.2, seed: int = 0) -> dict:
+    '''
+    Writes a random instance with `n` nodes. The distances are Euclidean distances between random
+    points in [0, 100]^dimensions (`coordinates` variant) or independent uniform values in
+    [1, 100] (`matrix` variant). The maximum budget K and the minimum capacity B are the
+    fractions `cost_tightness` and `capacity_tightness` of the total cost and capacity of the
+    nodes, so lower values give a tighter budget and a looser capacity constraint. The distances
+    are written row by row, so large instances are generated with constant memory (except for
+    the points of the `coordinates` variant). The same arguments always write the same instance.
+
+    Args:
+      path (str): path of the instance file.
+      n (int): number of nodes.
+      variant (str): how the distances are generated. {coordinates, matrix}.
+      dimensions (int): number of coordinates of each point in the `coordinates` variant.
+      cost_range (tuple): minimum and maximum cost of a node.
+      capacity_range (tuple): minimum and maximum capacity of a node.
+      distribution (str): distribution of the costs and capacities. {uniform, normal}.
+      cost_tightness (float): maximum budget K as a fraction of the total cost.
+      capacity_tightness (float): minimum capacity B as a fraction of the total capacity.
+      seed (int): random seed.
+
+    Returns:
+      (dict): number of nodes `n`, maximum budget `K` and minimum capacity `B` of the instance.
+    '''
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown instance variant '{variant}'.")
+
+    rng = random.Random(seed)
+    costs = draw_values(rng, n, *cost_range, distribution)
+    capacities = draw_values(rng, n, *capacity_range, distribution)
+    K = max(1, round(cost_tightness * sum(costs)))
+    B = round(capacity_tightness * sum(capacities))
+    if variant == 'coordinates':
+        points = [[rng.uniform(0, 100) for _ in range(dimensions)] for _ in range(n)]
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(f'{n}\n')
+        for u in range(n):
+            if variant == 'coordinates':
+                distances = [math.dist(points[u], points[v]) for v in range(u+1, n)]
+            else:
+                distances = [rng.uniform(1, 100) for _ in range(u+1, n)]
+            file.write(''.join([f'{u+1} {v} {d:.4f}\n'
+                                for v, d in enumerate(distances, start=u+2)]))
+        file.write(''.join([f'{u+1} {costs[u]} 0 {capacities[u]}\n' for u in range(n)]))
+        file.write(f'{K} 0 {B}\n')
+
+    return {'n': n, 'K': K, 'B': B}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generator of synthetic GDP instances')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 500, 1000],
+                        help='number of nodes of each instance')
+    parser.add_argument('--variant', choices=VARIANTS, default='coordinates',
+                        help='Euclidean distances between random points or a random matrix')
+    parser.add_argument('--dimensions', type=int, default=2,
+                        help='number of coordinates of the points (coordinates variant)')
+    parser.add_argument('--cost-range', type=int, nargs=2, default=[1, 20],
+                        help='minimum and maximum cost of a node')
+    parser.add_argument('--capacity-range', type=int, nargs=2, default=[1, 20],
+                        help='minimum and maximum capacity of a node')
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform',
+                        help='distribution of the costs and capacities')
+    parser.add_argument('--cost-tightness', type=float, default=0.3,
+                        help='maximum budget K as a fraction of the total cost')
+    parser.add_argument('--capacity-tightness', type=float, default=0.2,
+                        help='minimum capacity B as a fraction of the total capacity')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--output', default=os.path.join('instances', 'GDP', 'SYN'),
+                        help='directory where the instances are written')
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        path = os.path.join(args.output, f'syn_{args.variant[:3]}_n{n}_s{args.seed}.txt')
+        data = write_instance(path, n, args.variant, args.dimensions, args.cost_range,
+                              args.capacity_range, args.distribution, args.cost_tightness,
+                              args.capacity_tightness, args.seed)
+        print(f'{path}: n={data["n"]}, K={data["K"]}, B={data["B"]}')
@@ -0,0 +1,280 @@
+'''Micro-benchmarks of the solver hot paths and end-to-end GRASP benchmark per instance size'''
+import argparse
+import copy
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from generator import VARIANTS, write_instance
+from startup import SRC_DIR
+
+sys.path.insert(0, SRC_DIR)
+
+from constructives import biased_randomized  # noqa: E402
+from local_search import best_improve, fast_improve, first_improve  # noqa: E402
+from structure import dominance, instance  # noqa: E402
+from structure.solution import Solution  # noqa: E402
+from utils import execution, instrumentation  # noqa: E402
+from utils.config import read_config  # noqa: E402
+from utils.logger import set_level  # noqa: E402
+
+SIZES = [50, 100, 200]
+NEIGHBORHOODS = {'1-1': [1, 1], '1-2': [1, 2], '2-1': [2, 1]}
+
+# One improvement pass of each local search scheme, as called by the VND
+SCHEMES = {
+    'First': lambda sol, switch: first_improve.try_improvement(sol, 0, 'Dom', switch),
+    'Best': lambda sol, switch: best_improve.try_improvement(sol, 0, switch, max_time=15),
+    'Fast': lambda sol, switch: fast_improve.try_improvement(sol, 0, switch)
+}
+
+
+def measure(function, setup=None, repeat: int = 5, ops: int = 1) -> dict:
+    '''
+    Measures the wall time of a function. The setup is called (untimed) before each run, so
+    functions that modify their arguments always start from the same state.
+
+    Args:
+      function (callable): function to be measured, called with the arguments returned by setup.
+      setup (callable): function returning the tuple of arguments of each run.
+      repeat (int): number of runs.
+      ops (int): number of operations of each run, to report the time per operation.
+
+    Returns:
+      (dict): time statistics per operation (see `summarize`) and number of operations per run.
+    '''
+    times = []
+    for _ in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        function(*args)
+        times.append((time.perf_counter() - start) / ops)
+
+    return dict(summarize(times), ops=ops)
+
+
+def summarize(times: list) -> dict:
+    '''
+    Summarizes the times of the runs of a benchmark. The times of every run are kept, so two
+    benchmark results can be compared with a statistical test (see compare.py).
+
+    Args:
+      times (list): time of each run in seconds.
+
+    Returns:
+      (dict): median, minimum, mean and standard deviation of the times, number of runs and
+    time of each run.
+    '''
+    return {'median': statistics.median(times),
+            'min': min(times),
+            'mean': statistics.mean(times),
+            'stdev': statistics.stdev(times) if len(times) > 1 else 0,
+            'repeat': len(times),
+            'times': times}
+
+
+def build_solution(inst: dict, nodes: list) -> Solution:
+    '''Builds a solution with the given nodes.'''
+    sol = Solution(inst)
+    for u in nodes:
+        sol.add_to_solution(u)
+    return sol
+
+
+def add_nodes(sol: Solution, nodes: list):
+    '''Adds the nodes to the solution, one at a time.'''
+    for u in nodes:
+        sol.add_to_solution(u)
+
+
+def remove_nodes(sol: Solution, nodes: list):
+    '''Removes the nodes from the solution, one at a time.'''
+    for u in nodes:
+        sol.remove_from_solution(u)
+
+
+def run_instance(path: str, config: dict, repeat: int, iterations: int, grasp_runs: int,
+                 seed: int) -> dict:
+    '''
+    Runs the micro-benchmarks and the end-to-end GRASP benchmark of an instance.
+
+    Args:
+      path (str): path of the instance file.
+      config (dict): configuration of the algorithm.
+      repeat (int): number of runs of each micro-benchmark.
+      iterations (int): number of GRASP iterations of the end-to-end benchmark.
+      grasp_runs (int): number of executions of the end-to-end benchmark.
+      seed (int): random seed.
+
+    Returns:
+      (dict): results of each benchmark.
+    '''
+    results = {'read_instance': measure(instance.read_instance, lambda: (path,), repeat)}
+    inst = instance.read_instance(path)
+    n = inst['n']
+    rng = random.Random(seed)
+    k = max(2, n // 10)
+    sample = rng.sample(range(n), 2 * k)
+    base, nodes = sample[:k], sample[k:]  # Nodes of the solution and nodes added to it
+
+    results['add_to_solution'] = measure(
+        add_nodes, lambda: (build_solution(inst, base), nodes), repeat, len(nodes))
+    results['remove_from_solution'] = measure(
+        remove_nodes, lambda: (build_solution(inst, base + nodes), nodes), repeat, len(nodes))
+    results['create_candidate_list'] = measure(
+        biased_randomized.create_candidate_list, lambda: (build_solution(inst, base),), repeat)
+
+    # Local searches start from the largest solution of a seeded construction
+    random.seed(seed)
+    constructed = biased_randomized.construct(inst, config, 0)[-1]
+    for scheme, try_improvement in SCHEMES.items():
+        for name, switch in NEIGHBORHOODS.items():
+            results[f'{scheme.lower()}_improve_{name}'] = measure(
+                try_improvement, lambda: (copy.deepcopy(constructed), switch), repeat)
+
+    # Solutions of several constructions, as filtered in each execution
+    random.seed(seed)
+    solutions = []
+    for i in range(20):
+        build = biased_randomized.construct if i % 2 == 0 else biased_randomized.deconstruct
+        solutions.extend(build(inst, config, i % 2))
+    results['get_nondominated_solutions'] = measure(
+        dominance.get_nondominated_solutions, lambda: (solutions,), repeat)
+    results['get_nondominated_solutions']['n_solutions'] = len(solutions)
+
+    results['grasp'] = run_grasp(inst, dict(config, iterations=iterations), seed, grasp_runs)
+
+    return results
+
+
+def run_grasp(inst: dict, config: dict, seed: int, runs: int) -> dict:
+    '''
+    Runs the GRASP iterations of several executions (construction and local search), with
+    consecutive seeds, and filters the non-dominated solutions found in each one. The time per
+    phase of each execution is recorded with the instrumentation of the solver.
+
+    Args:
+      inst (dict): contains the instance data.
+      config (dict): configuration of the algorithm.
+      seed (int): random seed of the first execution.
+      runs (int): number of executions.
+
+    Returns:
+      (dict): wall time statistics (see `summarize`), and time of each phase, number of
+    iterations, number of solutions and non-dominated front (MaxSum, MaxMin) of each execution.
+    '''
+    times, phases, iterations, n_solutions, fronts = [], {}, [], [], []
+    instrumentation.enable()
+    for r in range(runs):
+        random.seed(seed + r)
+        instrumentation.reset()
+        start = datetime.datetime.now()
+        solutions = []
+        n_iterations = 0
+        for _, _, solution_list in execution.execute_iterations(inst, config, start, {}, None,
+                                                                None):
+            solutions.extend(solution_list)
+            n_iterations += 1
+        with instrumentation.timer('dominance_filtering'):
+            mask = dominance.get_nondominated_solutions(solutions)
+        times.append((datetime.datetime.now() - start).total_seconds())
+
+        for phase, phase_data in instrumentation.phases().items():
+            phases.setdefault(phase, []).append(phase_data['time'])
+        iterations.append(n_iterations)
+        n_solutions.append(len(solutions))
+        fronts.append([list(point) for point in sorted({(sol.of_MaxSum, sol.of_MaxMin)
+                                                        for sol, nondominated
+                                                        in zip(solutions, mask)
+                                                        if nondominated})])
+    instrumentation.enable(False)
+
+    return dict(summarize(times), phases=phases, iterations=iterations,
+                n_solutions=n_solutions, fronts=fronts)
+
+
+def get_metadata(args: argparse.Namespace) -> dict:
+    '''Describes the machine, code version and parameters of a benchmark run.'''
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SRC_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'variant': args.variant,
+            'repeat': args.repeat,
+            'iterations': args.iterations,
+            'grasp_runs': args.grasp_runs,
+            'seed': args.seed}
+
+
+def run(args: argparse.Namespace) -> dict:
+    '''
+    Runs the benchmarks of the given instance files, or of synthetic instances of each size.
+
+    Args:
+      args (argparse.Namespace): command line arguments.
+
+    Returns:
+      (dict): `metadata` of the run and `results` of each instance.
+    '''
+    config = copy.deepcopy(read_config('config')[0])
+    config['neighborhoods'] = {1: [1, 1], 2: [1, 2]}
+    config['workers'] = 1
+    config['execution_limits']['max_time'] = 10 ** 6  # The end-to-end run is not stopped
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = args.instances
+        if not paths:
+            paths = []
+            for n in args.sizes:
+                paths.append(os.path.join(work_dir, f'syn_{args.variant[:3]}_n{n}.txt'))
+                write_instance(paths[-1], n, args.variant, seed=args.seed)
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            print(f'Benchmarking {name}...', file=sys.stderr)
+            results[name] = run_instance(path, config, args.repeat, args.iterations,
+                                         args.grasp_runs, args.seed)
+
+    return {'metadata': get_metadata(args), 'results': results}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks of the solver hot paths')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='number of nodes of the random instances')
+    parser.add_argument('--variant', choices=VARIANTS, default='coordinates',
+                        help='variant of the synthetic instances (see generator.py)')
+    parser.add_argument('--instances', nargs='+',
+                        help='instance files benchmarked instead of the random instances')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs of each micro-benchmark')
+    parser.add_argument('--iterations', type=int, default=20,
+                        help='number of GRASP iterations of the end-to-end benchmark')
+    parser.add_argument('--grasp-runs', type=int, default=5,
+                        help='number of executions of the end-to-end benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--output', help='JSON file where the results are saved')
+    args = parser.parse_args()
+
+    set_level('WARNING')
+    results = run(args)
+    summary = {name: {benchmark: round(data['median'], 6)
+                      for benchmark, data in instance_results.items()}
+               for name, instance_results in results['results'].items()}
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
@@ -0,0 +1,103 @@
+'''Startup time benchmark of the solver entry point on a tiny instance'''
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from generator import write_instance
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+HEAVY_MODULES = ['pandas', 'plotly', 'numpy', 'pyarrow']
+
+# Imports the entry point and reports the heavy modules loaded by it
+IMPORT_SCRIPT = f'''
+import json, sys
+sys.path.insert(0, {SRC_DIR!r})
+import main
+print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))
+'''
+
+# Solves the instance directory given as argument with the modules of the entry point and a
+# small configuration
+SOLVE_SCRIPT = f'''
+import random, sys
+sys.path.insert(0, {SRC_DIR!r})
+import main
+from utils import execution
+config = dict(main.config_list[0], iterations=10, workers=1, checkpoint_time=0,
+              neighborhoods={{1: [1, 1], 2: [1, 2]}})
+random.seed(42)
+execution.execute_directory(sys.argv[1], config)
+'''
+
+
+def time_command(command: list, cwd: str, repeat: int) -> dict:
+    '''
+    Runs a command `repeat` times and measures its wall time.
+
+    Args:
+      command (list): command and arguments.
+      cwd (str): working directory of the command.
+      repeat (int): number of runs.
+
+    Returns:
+      (dict): median, minimum and maximum wall time in seconds, and the output of the last run.
+    '''
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run(command, cwd=cwd, capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+
+    return {'median': round(statistics.median(times), 4),
+            'min': round(min(times), 4),
+            'max': round(max(times), 4),
+            'stdout': process.stdout.strip().splitlines()[-1:]}
+
+
+def run(repeat: int) -> dict:
+    '''
+    Measures the time to start the interpreter, to import the entry point `src/main.py`, to run
+    `src/main.py --help` and to solve a tiny instance in a new process.
+
+    Args:
+      repeat (int): number of runs of each measure.
+
+    Returns:
+      (dict): results of each measure.
+    '''
+    with tempfile.TemporaryDirectory() as work_dir:
+        instance_dir = os.path.join('instances', 'GDP', 'TINY')
+        write_instance(os.path.join(work_dir, instance_dir, 'tiny_n12.txt'), 12)
+
+        results = {
+            'python': time_command([sys.executable, '-c', 'pass'], work_dir, repeat),
+            'import_main': time_command([sys.executable, '-c', IMPORT_SCRIPT], work_dir, repeat),
+            'main_help': time_command([sys.executable, os.path.join(SRC_DIR, 'main.py'),
+                                       '--help'], work_dir, repeat),
+            'solve_tiny': time_command([sys.executable, '-c', SOLVE_SCRIPT, instance_dir],
+                                       work_dir, repeat)
+        }
+    results['heavy_modules_imported'] = json.loads(results['import_main'].pop('stdout')[0])
+    for measure in results.values():
+        if isinstance(measure, dict):
+            measure.pop('stdout', None)
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Startup time of the solver entry point')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs of each measure')
+    parser.add_argument('--output', help='JSON file where the results are saved')
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
@@ -6,6 +6,8 @@ import utils
 SET = 'GDP'
 SUBSET = 'GKD-b_n50'
 PLOT_PARETO_FRONTS = True
+PLOT_TIME_TO_TARGET = False
+TARGET_RATIO = 0.95  # Target hypervolume as a fraction of the best one found
 
 
 '''Main evaluation function'''
@@ -18,5 +20,7 @@ if __name__ == '__main__':
     common_inst = utils.get_coincident_instances(result_dir, SET, SUBSET)
     if PLOT_PARETO_FRONTS:
         utils.plot_pareto_fronts(result_dir, SET, SUBSET, common_inst)
+    if PLOT_TIME_TO_TARGET:
+        utils.plot_time_to_target(result_dir, SET, SUBSET, common_inst, TARGET_RATIO)
 
     utils.calculate_performance_indicators(result_dir, SET, SUBSET, common_inst)
@@ -54,6 +54,21 @@ def epsilon_indicator_add(A, B):
     return eps
 
 
+def hypervolume(A, reference=(0, 0)):
+    '''
+    Calculates the area dominated by the bi-objective front A (both objectives maximized) and
+    bounded by the reference point, which is the hypervolume computed with pymoo for -A.
+    '''
+    area = 0
+    best_second = reference[1]
+    # Sweep the points by decreasing first objective, adding the new area of each point
+    for first, second in sorted(A, key=lambda a: (-a[0], -a[1])):
+        if second > best_second and first > reference[0]:
+            area += (first - reference[0]) * (second - best_second)
+            best_second = second
+    return area
+
+
 def add_front_area(figure: go.Figure, pareto_front: np.array, name: str, color):
     '''
     Adds a trace of the area generated under the Pareto front with respect to the origin (0, 0)
@@ -1,4 +1,6 @@
+import json
 import os
+import sqlite3
 import numpy as np
 import pandas as pd
 
@@ -10,21 +12,219 @@ from pymoo.indicators.hv import HV
 from reference_front import calculate_reference_front
 from performance_indicators import set_coverage, epsilon_indicator_mul
 
+RESULT_EXTENSIONS = ('.csv', '.parquet', '.feather')
+STORE_FILE = 'results.db'  # Consolidated results store in the results directory
+STORE_COLUMNS = {'Solution': 'nodes', 'MaxSum': 'maxsum', 'MaxMin': 'maxmin', 'Cost': 'cost',
+                 'Capacity': 'capacity'}
+STORE_CONNECTIONS = {}
+
+
+def get_store(result_dir: str) -> sqlite3.Connection:
+    '''Get the connection to the results store of `result_dir`, or None if there is no store'''
+    path = os.path.join(result_dir, STORE_FILE)
+    if not os.path.exists(path):
+        return None
+    if path not in STORE_CONNECTIONS:
+        STORE_CONNECTIONS[path] = sqlite3.connect(path)
+    return STORE_CONNECTIONS[path]
+
+
+def has_result_files(path: str) -> bool:
+    '''Check if a directory (or any of its subdirectories) contains result files, so the
+    directories with other outputs only (e.g. profiles) are not taken as results'''
+    for _, _, files in os.walk(path):
+        if any(f.startswith(('results_', 'ref_results_')) and f.endswith(RESULT_EXTENSIONS)
+               for f in files):
+            return True
+    return False
+
+
+def list_algorithms(result_dir: str) -> list:
+    '''Get the analyzed algorithms, from the results store and the result directories'''
+    algorithms = {alg for alg in os.listdir(result_dir)
+                  if os.path.isdir(os.path.join(result_dir, alg))
+                  and has_result_files(os.path.join(result_dir, alg))}
+    store = get_store(result_dir)
+    if store is not None:
+        algorithms.update(row[0] for row in store.execute('SELECT DISTINCT algorithm FROM runs'))
+
+    return sorted(algorithms)
+
+
+def list_instances(result_dir: str, alg: str, inst_set: str, inst_subset: str) -> list:
+    '''Get the instances solved by an algorithm, in the results store or the result directories'''
+    subset_path = os.path.join(result_dir, alg, inst_set, inst_subset)
+    instances = []
+    if os.path.isdir(subset_path):
+        instances = [i for i in os.listdir(subset_path)
+                     if os.path.isdir(os.path.join(subset_path, i))
+                     and has_result_files(os.path.join(subset_path, i))]
+    store = get_store(result_dir)
+    if store is not None:
+        instances += [row[0] for row in store.execute(
+            'SELECT DISTINCT instance FROM runs WHERE algorithm = ? AND instance_set = ? '
+            'AND subset = ?', (alg, inst_set, inst_subset)) if row[0] not in instances]
+
+    return instances
+
+
+def get_stored_executions(store: sqlite3.Connection, alg: str, inst_set: str, inst_subset: str,
+                          inst: str) -> set:
+    '''Get the execution numbers of an algorithm and instance saved in the results store'''
+    if store is None:
+        return set()
+    return {row[0] for row in store.execute(
+        'SELECT execution_n FROM runs WHERE algorithm = ? AND instance_set = ? AND subset = ? '
+        'AND instance = ?', (alg, inst_set, inst_subset, inst))}
+
+
+def list_unstored_files(result_dir: str, alg: str, inst_set: str, inst_subset: str, inst: str,
+                        prefixes: tuple, stored: set) -> list:
+    '''Get the paths and execution numbers of the files of an instance starting with one of the
+    `prefixes` whose executions are not in the results store (e.g. runs saved without it)'''
+    inst_path = os.path.join(result_dir, alg, inst_set, inst_subset, inst)
+    if not os.path.isdir(inst_path):
+        return []
+    files = [f for f in os.listdir(inst_path)
+             if f.startswith(prefixes) and f.endswith(RESULT_EXTENSIONS)]
+    return [(os.path.join(inst_path, f), get_execution_number(f)) for f in files
+            if get_execution_number(f) not in stored]
+
+
+def get_execution_number(filename: str) -> int:
+    '''Get the execution number of a result file, e.g. 3 for `results_3.csv`'''
+    return int(os.path.splitext(os.path.basename(filename))[0].split('_')[-1])
+
+
+def read_executions(result_dir: str, alg: str, inst_set: str, inst_subset: str, inst: str,
+                    columns: list = None) -> list:
+    '''Read the solutions of every execution of an algorithm for an instance, sorted by execution
+    number, with one query to the results store and reading the solution files of the executions
+    that are not in the store'''
+    columns = columns or list(STORE_COLUMNS)
+    store = get_store(result_dir)
+    executions = []
+    if store is not None:
+        fields = ', '.join(f's.{STORE_COLUMNS[c]} AS {c}' for c in columns)
+        table = pd.read_sql_query(
+            f'SELECT r.run_id, r.execution_n, {fields} FROM runs r '
+            'LEFT JOIN solutions s ON r.run_id = s.run_id WHERE r.algorithm = ? '
+            'AND r.instance_set = ? AND r.subset = ? AND r.instance = ? '
+            'ORDER BY r.execution_n, r.run_id',
+            store, params=(alg, inst_set, inst_subset, inst))
+        # Runs without solutions are kept as empty tables
+        executions = [(run.execution_n.iloc[0],
+                       run.dropna(how='all', subset=columns)[columns].reset_index(drop=True))
+                      for _, run in table.groupby('run_id', sort=False)]
+
+    stored = {execution_n for execution_n, _ in executions}
+    executions += [(execution_n, read_results(path, columns)) for path, execution_n
+                   in list_unstored_files(result_dir, alg, inst_set, inst_subset, inst,
+                                          ('results_', 'ref_results_'), stored)]
+    executions.sort(key=lambda execution: execution[0])
+
+    return [solutions for _, solutions in executions]
+
+
+def read_add_data(result_dir: str, alg: str, inst_set: str, inst_subset: str,
+                  inst: str) -> pd.DataFrame:
+    '''Read the additional data (e.g. execution time) of every execution of an algorithm for an
+    instance, sorted by execution number, from the results store and the `add_data.csv` (or
+    `ex_times.csv`) file of the executions that are not in the store'''
+    store = get_store(result_dir)
+    tables = []
+    if store is not None:
+        rows = store.execute(
+            'SELECT execution_n, add_data FROM runs WHERE algorithm = ? AND instance_set = ? '
+            'AND subset = ? AND instance = ? ORDER BY execution_n, run_id',
+            (alg, inst_set, inst_subset, inst))
+        tables.append(pd.DataFrame([{'ex_number': execution_n, **json.loads(add_data)}
+                                    for execution_n, add_data in rows]))
+
+    inst_path = os.path.join(result_dir, alg, inst_set, inst_subset, inst)
+    for file in ('add_data.csv', 'ex_times.csv'):
+        if os.path.exists(os.path.join(inst_path, file)):
+            table = pd.read_csv(os.path.join(inst_path, file))
+            stored = get_stored_executions(store, alg, inst_set, inst_subset, inst)
+            tables.append(table[~table.ex_number.isin(stored)])
+            break
+
+    tables = [table for table in tables if len(table) > 0]
+    if len(tables) == 0:
+        return pd.DataFrame(columns=['ex_number'])
+    return pd.concat(tables).sort_values('ex_number', kind='stable').reset_index(drop=True)
+
+
+def read_traces(result_dir: str, alg: str, inst_set: str, inst_subset: str,
+                inst: str) -> list:
+    '''Read the anytime trace (time, iterations, hypervolume and nd_sols each time the archive
+    changed) of every execution of an algorithm for an instance, sorted by execution number, from
+    the results store and the trace files of the executions that are not in the store'''
+    store = get_store(result_dir)
+    traces = []
+    if store is not None:
+        table = pd.read_sql_query(
+            'SELECT r.run_id, r.execution_n, t.time, t.iterations, t.hypervolume, t.nd_sols '
+            'FROM runs r JOIN traces t ON r.run_id = t.run_id WHERE r.algorithm = ? '
+            'AND r.instance_set = ? AND r.subset = ? AND r.instance = ? '
+            'ORDER BY r.execution_n, r.run_id, t.time',
+            store, params=(alg, inst_set, inst_subset, inst))
+        traces = [(run.execution_n.iloc[0],
+                   run.drop(columns=['run_id', 'execution_n']).reset_index(drop=True))
+                  for _, run in table.groupby('run_id', sort=False)]
+
+    stored = get_stored_executions(store, alg, inst_set, inst_subset, inst)
+    traces += [(execution_n, pd.read_csv(path)) for path, execution_n
+               in list_unstored_files(result_dir, alg, inst_set, inst_subset, inst, ('trace_',),
+                                      stored)]
+    traces.sort(key=lambda trace: trace[0])
+
+    return [trace for _, trace in traces]
+
+
+def time_to_target(trace: pd.DataFrame, target: float) -> float:
+    '''Get the first time when the hypervolume of an execution reached the target, or infinity
+    if it was never reached'''
+    reached = trace.loc[trace.hypervolume >= target, 'time']
+    return float(reached.iloc[0]) if len(reached) > 0 else float('inf')
+
+
+def read_results(filename: str, columns: list = None) -> pd.DataFrame:
+    '''Read the solutions of an execution from a CSV, Parquet or Feather file. Only the given
+    `columns` are read from the columnar files, where `Solution` is a list of nodes'''
+    if filename.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.read_table(filename, columns=columns).to_pandas()
+    if filename.endswith('.feather'):
+        import pyarrow.feather as feather
+        return feather.read_table(filename, columns=columns).to_pandas()
+    return pd.read_csv(filename, usecols=columns)
+
+
+def read_run_metadata(filename: str) -> dict:
+    '''Read the metadata of an execution (execution number, parameters, instance and additional
+    data) saved in a Parquet or Feather file'''
+    import pyarrow as pa
+    if filename.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        metadata = pq.read_schema(filename).metadata
+    else:
+        with pa.memory_map(filename) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata
+    metadata = {key.decode(): value.decode() for key, value in metadata.items()
+                if not key.startswith(b'pandas')}
+    metadata['add_data'] = json.loads(metadata['add_data'])
+
+    return metadata
+
 
 def get_coincident_instances(result_dir: str, inst_set: str, inst_subset: str) -> list:
     '''Get instances with solutions available for all the analyzed algorithms'''
     instances = []
 
     # Loop all analyzed algorithms
-    algorithms_config = os.listdir(result_dir)
-    for alg in algorithms_config:
-        if alg.endswith('.csv') or alg.endswith('.html'):
-            continue
-
-        subset_path = os.path.join(result_dir, alg, inst_set, inst_subset)
-        subset_inst = os.listdir(subset_path)
-        subset_inst = [i for i in subset_inst if i not in ['add_data.csv', 'ex_times.csv']]
-        instances.append(subset_inst)
+    for alg in list_algorithms(result_dir):
+        instances.append(list_instances(result_dir, alg, inst_set, inst_subset))
 
     common_instances = list(set.intersection(*map(set, instances)))
     common_instances = [i for i in common_instances
@@ -41,19 +241,11 @@ def plot_pareto_fronts(output_dir: str, inst_set: str, inst_subset: str, instanc
     total_rows = len(instances) // 2 + len(instances) % 2
 
     fig = make_subplots(rows=total_rows, cols=2, subplot_titles=instances)
-    for alg in os.listdir(output_dir):
-        if alg.endswith('.csv') or alg.endswith('.html'):
-            continue
-
+    for alg in list_algorithms(output_dir):
         col, row = 1, 1
         for count, inst in enumerate(instances):
-            inst_path = os.path.join(output_dir, alg, inst_set, inst_subset, inst)
-            file = [f for f in os.listdir(inst_path)
-                    if f not in ['add_data.csv', 'ex_times.csv']][0]
-
-            filename = os.path.join(inst_path, file)
-
-            result_table = pd.read_csv(filename)
+            result_table = read_executions(output_dir, alg, inst_set, inst_subset, inst,
+                                           ['MaxSum', 'MaxMin', 'Cost', 'Capacity'])[0]
 
             legend_name = 'Constraint values'
             result_table[legend_name] = ('Cost: ' + result_table.Cost.astype(str) +
@@ -84,31 +276,70 @@ def plot_pareto_fronts(output_dir: str, inst_set: str, inst_subset: str, instanc
     # fig.show()
 
 
+def plot_time_to_target(output_dir: str, inst_set: str, inst_subset: str, instances: list,
+                        target_ratio: float = 0.95):
+    '''Plot the time-to-target distribution of all the analyzed algorithms. The target of each
+    instance is a fraction of the best final hypervolume found by any algorithm, and each curve is
+    the empirical probability of reaching the target within a given time'''
+    colors = px.colors.qualitative.Plotly
+    algorithms = list_algorithms(output_dir)
+
+    total_rows = len(instances) // 2 + len(instances) % 2
+
+    fig = make_subplots(rows=total_rows, cols=2, subplot_titles=instances)
+    for count, inst in enumerate(instances):
+        row, col = count // 2 + 1, count % 2 + 1
+        traces = {alg: read_traces(output_dir, alg, inst_set, inst_subset, inst)
+                  for alg in algorithms}
+        final_hv = [trace.hypervolume.iloc[-1] for alg_traces in traces.values()
+                    for trace in alg_traces if len(trace) > 0]
+        if len(final_hv) == 0:
+            continue
+        target = target_ratio * max(final_hv)
+
+        for color_count, (alg, alg_traces) in enumerate(traces.items()):
+            if len(alg_traces) == 0:
+                continue
+            times = sorted(time_to_target(trace, target) for trace in alg_traces)
+            reached = [t for t in times if t != float('inf')]
+            probability = [(i + 0.5) / len(times) for i in range(len(reached))]
+            fig.add_scatter(x=reached, y=probability, mode='lines+markers',
+                            line_shape='hv', line_color=colors[color_count % len(colors)],
+                            row=row, col=col, name=alg, legendgroup=alg,
+                            showlegend=True if count == 0 else False)
+
+    fig.update_xaxes(title_text='Time (s)')
+    fig.update_yaxes(title_text=f'P(HV >= {target_ratio} best HV)', range=[0, 1])
+    fig.update_layout(height=400 * total_rows)
+
+    print('Saving figure')
+    fig.write_html(os.path.join(output_dir, 'time_to_target.html'))
+
+
 def calculate_performance_indicators(result_dir, inst_set, inst_subset, instances: list):
     '''Calculates performance indicator and saves results in a CSV file'''
     # Initialize result summary table
     general_indicators = pd.DataFrame(columns=['inst', 'alg_config', 'time', 'HV', 'SC', 'eps'])
 
+    # Reference Pareto Front of each instance, shared by all the algorithms
+    reference_pareto_fronts = {}
+
     # Loop all analyzed algorithms
-    algorithms_config = os.listdir(result_dir)
-    for alg in algorithms_config:
-        if alg.endswith('.csv') or alg.endswith('.html'):
-            continue
+    for alg in list_algorithms(result_dir):
         print(f'Evaluating algorithm {alg}')
 
-        # Evaluated instance set path
-        set_path = os.path.join(result_dir, alg, inst_set, inst_subset)
         for count, inst in enumerate(instances):
             if inst.endswith('.csv') or inst.endswith('.html'):
                 continue
             print(f'    Evaluating instance {count+1}/{len(instances)}')
-            inst_path = os.path.join(set_path, inst)
 
             # Obtain reference pareto front considering all the solutions
-            reference_pareto_front = calculate_reference_front(result_dir,
-                                                               inst_set,
-                                                               inst_subset,
-                                                               inst)
+            if inst not in reference_pareto_fronts:
+                reference_pareto_fronts[inst] = calculate_reference_front(result_dir,
+                                                                          inst_set,
+                                                                          inst_subset,
+                                                                          inst)
+            reference_pareto_front = reference_pareto_fronts[inst]
             if reference_pareto_front.empty:
                 continue
             reference_pareto_front = reference_pareto_front[['MaxSum', 'MaxMin']].to_numpy()
@@ -116,12 +347,9 @@ def calculate_performance_indicators(result_dir, inst_set, inst_subset, instance
             # Indicators
             indicators = pd.DataFrame(columns=['HV', 'SC', 'eps'])
 
-            # Loop all the executions run during the experiments (1 csv per execution)
-            executions = os.listdir(inst_path)
-            for exec in executions:
-                if exec in ['add_data.csv', 'ex_times.csv']:  # Ignore execution time csv
-                    continue
-                solutions = pd.read_csv(os.path.join(inst_path, exec))
+            # Loop all the executions run during the experiments
+            for solutions in read_executions(result_dir, alg, inst_set, inst_subset, inst,
+                                             ['MaxSum', 'MaxMin']):
                 current_pareto_front = solutions[['MaxSum', 'MaxMin']].to_numpy()
 
                 # Calculate hypervolume
@@ -140,11 +368,8 @@ def calculate_performance_indicators(result_dir, inst_set, inst_subset, instance
                                                              'SC': [sc],
                                                              'eps': [eps]}))
 
-            # Get table (csv) containing the exection time of all the experiments
-            if 'add_data.csv' in executions:
-                evaluation_table = pd.read_csv(os.path.join(inst_path, 'add_data.csv'))
-            elif 'ex_times.csv' in executions:
-                evaluation_table = pd.read_csv(os.path.join(inst_path, 'ex_times.csv'))
+            # Get table containing the exection time of all the experiments
+            evaluation_table = read_add_data(result_dir, alg, inst_set, inst_subset, inst)
             evaluation_table = evaluation_table.join(indicators.round(2).reset_index(drop=True))
 
             # Save summary
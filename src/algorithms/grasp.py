@@ -1,16 +1,20 @@
 '''GRASP execution function (construction and LS calls)'''
 import copy
+from collections import OrderedDict
 
 from constructives import biased_randomized
 from local_search import variable_neighborhood_descent
 from structure.solution import Solution
 
+from utils import instrumentation
 from utils.logger import load_logger
 
 logging = load_logger(__name__)
 
 
-def execute(inst: dict, config: dict, objective: int, iteration: int) -> Solution:
+def execute(inst: dict, config: dict, objective: int, iteration: int,
+            nb_stats: dict = None, memo: 'LocalSearchMemo' = None,
+            duplicates: dict = None) -> Solution:
     '''The function executes a GRASP algorithm with a specified number of iterations and a given
     beta value, selecting the best solution found during the iterations.
 
@@ -22,6 +26,14 @@ def execute(inst: dict, config: dict, objective: int, iteration: int) -> Solutio
       config (dict): contains the construction and local search strategies defined by the user in
     the config file.
       objective (int): ID of the objective considered for this iteration. {0: MaxSum, 1: MaxMin}.
+      nb_stats (dict): statistics of each neighborhood explored in the local search, shared
+    between iterations.
+      memo (LocalSearchMemo): results of the local searches of previous iterations. If a local
+    search starts from an already improved node set, the improved solution is taken from the memo.
+      duplicates (dict): used when there is no memo. Contains the set `ls_starts` with the node set
+    hashes of the solutions already improved in previous iterations, and the counter `ls_skipped`
+    of the local searches skipped because they start from one of these solutions. Since the local
+    search is deterministic, the improved solution is already known and it is not returned again.
 
     Returns:
         (Solution): the solution found.
@@ -31,16 +43,17 @@ def execute(inst: dict, config: dict, objective: int, iteration: int) -> Solutio
     ls_strategy = config.get('strategy')
     ls_scheme = config.get('scheme')
 
-    print('Executing GRASP algorithm with: ')
-    print('\tBiased construction with parameters %s', parameters)
-    print('\t%s Local Search strategy following the %s Improve scheme',
-          ls_strategy, ls_scheme)
+    logging.debug('Executing GRASP algorithm with biased construction with parameters %s and %s '
+                  'Local Search strategy following the %s Improve scheme',
+                  parameters, ls_strategy, ls_scheme)
 
     # Construction phase (Biased GRASP)
-    if iteration % 4 in {0, 1}:
-        solution_list = biased_randomized.construct(inst, config, objective)
-    elif iteration % 4 in {2, 3}:
-        solution_list = biased_randomized.deconstruct(inst, config, objective)
+    with instrumentation.timer('construction'):
+        if iteration % 4 in {0, 1}:
+            solution_list = biased_randomized.construct(inst, config, objective)
+        elif iteration % 4 in {2, 3}:
+            solution_list = biased_randomized.deconstruct(inst, config, objective)
+    instrumentation.count('constructed_solutions', len(solution_list))
 
     c_sol_list = copy.deepcopy(solution_list)
 
@@ -50,11 +63,85 @@ def execute(inst: dict, config: dict, objective: int, iteration: int) -> Solutio
     elif len(solution_list) == 1:
         ls_sols = [0]
 
-    for sol in [solution_list[i] for i in ls_sols]:  # Apply LS only to 1st and last solutions
-        if len(sol.solution_set) > 0:  # Ensure a solution is constructed
-            variable_neighborhood_descent.improve(sol, config)
+    ls_key = local_search_key(config)
+    skipped = []
+    for i in ls_sols:  # Apply LS only to 1st and last solutions
+        sol = solution_list[i]
+        if len(sol.solution_set) == 0:  # Ensure a solution is constructed
+            continue
+        if memo is not None:
+            # Answer local searches from an already improved node set with the memo
+            key = (sol.node_hash, ls_key)
+            improved_sol = memo.get(key)
+            if improved_sol is not None:
+                solution_list[i] = improved_sol
+                continue
+        elif duplicates is not None:
+            # Skip local searches from a node set that has already been improved
+            if sol.node_hash in duplicates['ls_starts']:
+                duplicates['ls_skipped'] += 1
+                skipped.append(sol)
+                continue
+            duplicates['ls_starts'].add(sol.node_hash)
+        with instrumentation.timer('local_search'):
+            variable_neighborhood_descent.improve(sol, config, nb_stats)
+        instrumentation.count('local_searches')
+        if memo is not None:
+            memo.put(key, sol)
+    solution_list = [sol for sol in solution_list if not any(sol is s for s in skipped)]
 
     # c_sol_list = [c_sol_list[i] for i in [0, -1]]
     # solution_list = [solution_list[i] for i in [0, -1]]
 
     return c_sol_list, solution_list
+
+
+def local_search_key(config: dict) -> tuple:
+    '''Builds a hashable key with the config parameters that determine the result of the local
+    search from a given solution.
+
+    Args:
+      config (dict): contains the local search strategies defined by the user in the config file.
+
+    Returns:
+      (tuple): the local search configuration.
+    '''
+    neighborhoods = config.get('neighborhoods') or {}
+    return (config.get('strategy'), config.get('scheme'), config.get('mo_approach_LS'),
+            tuple((nb, tuple(switch)) for nb, switch in neighborhoods.items()),
+            config.get('execution_limits').get('max_local_search_it'))
+
+
+class LocalSearchMemo:
+    '''Bounded LRU memo of the solutions obtained by the local search, keyed by the node set
+    hash of the starting solution and the local search configuration. The local search is
+    deterministic for a given starting node set, so a repeated local search would return the same
+    solution (with the 'Adaptive' neighborhood order the result is one of the local optima that
+    can be reached from the starting solution).'''
+    def __init__(self, max_size: int = 1000):
+        '''Initialize LocalSearchMemo
+
+        Args:
+          max_size (int): maximum number of local search results kept in the memo. The least
+        recently used result is removed when it is exceeded.
+        '''
+        self.memo = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Solution:
+        '''Returns a copy of the improved solution saved for `key`, or None if it is not saved.'''
+        if key not in self.memo:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.memo.move_to_end(key)
+        return copy.deepcopy(self.memo[key])
+
+    def put(self, key: tuple, sol: Solution):
+        '''Saves a copy of the improved solution `sol` for `key`.'''
+        self.memo[key] = copy.deepcopy(sol)
+        self.memo.move_to_end(key)
+        if len(self.memo) > self.max_size:
+            self.memo.popitem(last=False)
@@ -0,0 +1,164 @@
+'''Path Relinking post-optimization between non-dominated solutions'''
+import copy
+from itertools import combinations
+
+from structure.solution import Solution
+
+from utils.logger import load_logger
+
+logging = load_logger(__name__)
+
+
+def execute(solutions: list) -> list:
+    '''Applies Path Relinking between every pair of the given (non-dominated) solutions. The path
+    between two solutions is walked in both directions, and every feasible intermediate solution
+    is returned so it can be added to the archive of solutions.
+
+    Args:
+      solutions (list): solutions (Solution instances) used as initial and guiding solutions.
+
+    Returns:
+      (list): feasible intermediate solutions found in the paths between all the solution pairs.
+    '''
+    intermediate_solutions = []
+    for sol_a, sol_b in combinations(solutions, 2):
+        if sol_a.solution_set == sol_b.solution_set:
+            continue
+        intermediate_solutions += relink(sol_a, sol_b)
+        intermediate_solutions += relink(sol_b, sol_a)
+
+    logging.info('Path Relinking found %s intermediate solutions between %s solutions.',
+                 len(intermediate_solutions), len(solutions))
+
+    return intermediate_solutions
+
+
+def relink(initial: Solution, guiding: Solution) -> list:
+    '''Walks from `initial` solution towards `guiding` solution through the symmetric difference
+    of their node sets. In each step, a single move is performed: a swap between a node only in
+    `initial` and a node only in `guiding` or, when one of both sets is exhausted, the addition or
+    removal of the remaining nodes. The move is selected greedily alternating the MaxSum and MaxMin
+    objectives in each step, prefering moves that keep the solution feasible.
+
+    Args:
+      initial (Solution): solution from which the path starts.
+      guiding (Solution): solution towards which the path is walked.
+
+    Returns:
+      (list): feasible intermediate solutions in the path (`initial` and `guiding` excluded).
+    '''
+    sol = copy.deepcopy(initial)
+    to_add = guiding.solution_set - sol.solution_set
+    to_remove = sol.solution_set - guiding.solution_set
+
+    intermediate_solutions = []
+    step = 0
+    # The last move would reach the guiding solution, so stop one move before
+    while len(to_add) + len(to_remove) > 1:
+        objective = step % 2  # 0: MaxSum, 1: MaxMin
+        move = select_move(sol, to_add, to_remove, objective)
+        if move is None:
+            break
+        u, v, sum_variation, min_distance = move
+
+        # Apply selected move
+        if u != -1:
+            sol.remove_from_solution(u)
+            to_remove.remove(u)
+        if v != -1:
+            sol.add_to_solution(v, min_distance, sum_variation)
+            to_add.remove(v)
+
+        # If solution is feasible, save it as a new intermediate solution
+        if sol.is_feasible() and sol.satisfies_capacity() and sol.satisfies_cost():
+            intermediate_solutions.append(copy.deepcopy(sol))
+        step += 1
+
+    return intermediate_solutions
+
+
+def select_move(sol: Solution, to_add: set, to_remove: set, objective: int):
+    '''Evaluates all the moves towards the guiding solution with incremental evaluation and
+    selects the one that maximizes the `objective`. Feasible moves (in terms of cost and capacity)
+    are always prefered over infeasible ones.
+
+    Args:
+      sol (Solution): current solution in the path.
+      to_add (set): nodes of the guiding solution that are not in the current solution.
+      to_remove (set): nodes of the current solution that are not in the guiding solution.
+      objective (int): ID of the objective considered for this step. {0: MaxSum, 1: MaxMin}.
+
+    Returns:
+      (tuple): the removed node `u` (-1 if no node is removed), the added node `v` (-1 if no node
+    is added), the sum of distances and the minimum distance from `v` to the solution without `u`.
+    `None` if there are no moves available.
+    '''
+    distances = sol.instance['d']
+
+    # Objective function values of the candidates, computed once per step
+    d_sum_add = {v: sol.distance_sum_to_solution(v) for v in to_add}
+    d_min_add = {v: sol.minimum_distance_to_solution(v) for v in to_add}
+    d_sum_remove = {u: sol.distance_sum_to_solution(u) for u in to_remove}
+    maxmin_without = {u: maxmin_without_node(sol, u) for u in to_remove}
+
+    moves = []
+    if len(to_add) > 0 and len(to_remove) > 0:
+        # Swap moves: remove u and add v
+        for u in to_remove:
+            for v in to_add:
+                sum_variation = d_sum_add[v] - distances[u][v]
+                min_distance = d_min_add[v]
+                if distances[u][v] == min_distance:
+                    min_distance = sol.minimum_distance_to_solution(v, without=[u])
+                new_maxsum = sol.of_MaxSum - d_sum_remove[u] + sum_variation
+                new_maxmin = min(maxmin_without[u], min_distance)
+                feasible = sol.satisfies_cost([v], [u]) and sol.satisfies_capacity([v], [u])
+                moves.append((feasible, new_maxsum, new_maxmin, (u, v, sum_variation,
+                                                                 min_distance)))
+    elif len(to_add) > 0:
+        # Add moves
+        for v in to_add:
+            new_maxsum = sol.of_MaxSum + d_sum_add[v]
+            new_maxmin = min(sol.of_MaxMin, d_min_add[v])
+            feasible = sol.satisfies_cost([v]) and sol.satisfies_capacity([v])
+            moves.append((feasible, new_maxsum, new_maxmin, (-1, v, d_sum_add[v], d_min_add[v])))
+    elif len(to_remove) > 0:
+        # Remove moves
+        for u in to_remove:
+            new_maxsum = sol.of_MaxSum - d_sum_remove[u]
+            new_maxmin = maxmin_without[u]
+            feasible = sol.satisfies_cost(v=[u]) and sol.satisfies_capacity(v=[u])
+            moves.append((feasible, new_maxsum, new_maxmin, (u, -1, -1, -1)))
+
+    if len(moves) == 0:
+        return None
+
+    if objective == 0:
+        best = max(moves, key=lambda m: (m[0], m[1], m[2]))
+    else:
+        best = max(moves, key=lambda m: (m[0], m[2], m[1]))
+
+    return best[3]
+
+
+def maxmin_without_node(sol: Solution, u: int) -> float:
+    '''Calculates the minimum pairwise distance between the nodes in the solution if node `u` is
+    removed. It is only recomputed if `u` is one of the nodes that define the current MaxMin.
+
+    Args:
+      sol (Solution): contains the solution information.
+      u (int): represents the ID of a node in solution.
+
+    Returns:
+      (float): the MaxMin value of the solution without `u`.
+    '''
+    if sol.minimum_distance_to_solution(u) > sol.of_MaxMin:
+        return sol.of_MaxMin
+
+    min_d = 0x3f3f3f3f
+    for s in sol.solution_set:
+        if s != u:
+            d = sol.minimum_distance_to_solution(s, without=[u])
+            if d < min_d:
+                min_d = d
+    return round(min_d, 2)
@@ -62,7 +62,9 @@ def construct(inst: dict, config: dict, objective: int) -> Solution:
             cl.sort(key=lambda row: -row[3])
         else:
             cl.sort(key=lambda row: -row[objective])
-        print('Sorted biased candidate list with %s objective.', OBJECTIVE_FUNCTIONS.get(objective))
+        if __debug__:  # Per-step message, compiled out with python -O
+            logging.debug('Sorted biased candidate list with %s objective.',
+                          OBJECTIVE_FUNCTIONS.get(objective))
 
         # Biased Randomization to select new node to add to solution
         if distribution == 'Geometric':
@@ -141,7 +143,9 @@ def deconstruct(inst: dict, config: dict, objective: int) -> Solution:
             cl.sort(key=lambda row: row[3])
         else:
             cl.sort(key=lambda row: row[objective])
-        print('Sorted biased candidate list with %s objective.', OBJECTIVE_FUNCTIONS.get(objective))
+        if __debug__:  # Per-step message, compiled out with python -O
+            logging.debug('Sorted biased candidate list with %s objective.',
+                          OBJECTIVE_FUNCTIONS.get(objective))
 
         # Biased Randomization to select new node to add to solution
         if distribution == 'Geometric':
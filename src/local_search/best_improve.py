@@ -20,7 +20,7 @@ logging = load_logger(__name__)
 # TODO IMPLEMENT ALT LOCAL SEARCH STRATEGY
 
 def try_improvement(sol: Solution, objective: int = 0,
-                    switch: list = [1, 1], max_time: int = 5) -> bool:
+                    switch: list = [1, 1], max_time: int = 5, stats: dict = None) -> bool:
     '''Attempts to improve a solution by selecting and interchanging a selected element (node)
     with an unselected element. The improvement is obtained if the new solution dominates the
     previous solution.
@@ -35,6 +35,8 @@ def try_improvement(sol: Solution, objective: int = 0,
     a standard 1-1 exchange.
       max_time (int): maximum local search execution time in seconds. If no improvement is find
     in this time, the local search is stopped.
+      stats (dict): optional neighborhood statistics, whose `moves` counter is increased with the
+    number of exchanges evaluated.
 
     Returns:
       (bool): `True` if the improvement was successful (i.e., if the objective values are
@@ -43,7 +45,8 @@ def try_improvement(sol: Solution, objective: int = 0,
     (worst_selected,
      sel_maxsum_variability, sel_maxmin,
      best_unselected,
-     unsel_maxsum_variability, unsel_maxmin) = select_exchange(sol, objective, switch, max_time)
+     unsel_maxsum_variability, unsel_maxmin) = select_exchange(sol, objective, switch, max_time,
+                                                               stats)
 
     # Make exchange if new solution dominates old solution
     new_dominates_old = exchange_is_dominant(sel_maxsum_variability, sel_maxmin,
@@ -57,7 +60,8 @@ def try_improvement(sol: Solution, objective: int = 0,
     return False
 
 
-def select_exchange(sol: Solution, objective: int, switch: list, max_time: int = 5):
+def select_exchange(sol: Solution, objective: int, switch: list, max_time: int = 5,
+                    stats: dict = None):
     '''Interchanges the worst element in solution (lowest sum of distances to the rest of the
     selected elements) with the best unselected element (highest sum of distances to the rest
     of the selected elements).
@@ -67,6 +71,8 @@ def select_exchange(sol: Solution, objective: int, switch: list, max_time: int =
       switch (list): indicates the neighborhood being analized in the local search. The
     first element defines how many nodes will be removed from the solution and the second
     element determines the number of nodes that will be added to the solution.
+      stats (dict): optional neighborhood statistics, whose `moves` counter is increased with the
+    number of exchanges evaluated.
 
     Returns:
       sel (int): worst selected element ID.
@@ -92,6 +98,9 @@ def select_exchange(sol: Solution, objective: int, switch: list, max_time: int =
     best_sum_unsel = 0
     best_min_unsel = 0
 
+    if stats is not None:
+        stats['moves'] += len(selected_combinations) * len(unselected_combinations)
+
     start = datetime.datetime.now()
     for combo_s in selected_combinations:
         # If time is exceeded break LS without improvement
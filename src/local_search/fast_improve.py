@@ -13,7 +13,8 @@ from utils.logger import load_logger
 logging = load_logger(__name__)
 
 
-def try_improvement(sol: Solution, objective: int, switch: int = [1, 1]) -> bool:
+def try_improvement(sol: Solution, objective: int, switch: int = [1, 1],
+                    stats: dict = None) -> bool:
     '''Attempts to improve a solution by selecting and interchanging a selected element (node)
     with an unselected element. The improvement is obtained if the new solution dominates the
     previous solution.
@@ -24,6 +25,8 @@ def try_improvement(sol: Solution, objective: int, switch: int = [1, 1]) -> bool
     first element defines how many nodes will be removed from the solution and the second
     element determines the number of nodes that will be added to the solution. Defaults to
     [1, 1] for a standard 1-1 exchange.
+      stats (dict): optional neighborhood statistics, whose `moves` counter is increased with the
+    number of exchanges evaluated.
 
     Returns:
       (bool): `True` if the improvement was successful (i.e., if the objective values are
@@ -32,7 +35,7 @@ def try_improvement(sol: Solution, objective: int, switch: int = [1, 1]) -> bool
     (worst_selected,
      sel_maxsum_variability, sel_maxmin,
      best_unselected,
-     unsel_maxsum_variability, unsel_maxmin) = select_exchange(sol, switch)
+     unsel_maxsum_variability, unsel_maxmin) = select_exchange(sol, switch, stats)
 
     # Make exchange if new solution dominates old solution
     new_dominates_old = exchange_is_dominant(sel_maxsum_variability, sel_maxmin,
@@ -46,7 +49,7 @@ def try_improvement(sol: Solution, objective: int, switch: int = [1, 1]) -> bool
     return False
 
 
-def select_exchange(sol: Solution, switch: list):
+def select_exchange(sol: Solution, switch: list, stats: dict = None):
     '''Interchanges the worst element in solution (lowest sum of distances to the rest of the
     selected elements) with the best unselected element (highest sum of distances to the rest
     of the selected elements).
@@ -56,6 +59,8 @@ def select_exchange(sol: Solution, switch: list):
       switch (list): indicates the neighborhood being analized in the local search. The
     first element defines how many nodes will be removed from the solution and the second
     element determines the number of nodes that will be added to the solution.
+      stats (dict): optional neighborhood statistics, whose `moves` counter is increased with the
+    number of exchanges evaluated.
 
     Returns:
       sel (int): worst selected element ID.
@@ -74,6 +79,7 @@ def select_exchange(sol: Solution, switch: list):
     unsel = -1
     best_sum_unsel = 0
     best_min_unsel = 0
+    moves = 0
     # For every element combination of size switch[0] in current solution, select the
     # one with the worst objective function values
     for combo in combinations(sol.solution_set, switch[0]):
@@ -89,6 +95,7 @@ def select_exchange(sol: Solution, switch: list):
     # the one with the best objective function values
     for combo in combinations(range(n), switch[1]):
         if not any(sol.contains(v) for v in combo):
+            moves += 1
             pairwise_d = get_all_pairwise_distances(sol.instance, combo)
             d_sum = [sol.distance_sum_to_solution(v, without=sel) for v in combo] + pairwise_d
             d_min = [sol.minimum_distance_to_solution(v, without=sel) for v in combo] + pairwise_d
@@ -102,4 +109,7 @@ def select_exchange(sol: Solution, switch: list):
                 best_min_unsel = min(d_min)
                 unsel = list(combo)
 
+    if stats is not None:
+        stats['moves'] += moves
+
     return sel, best_sum_sel, best_min_sel, unsel, best_sum_unsel, best_min_unsel
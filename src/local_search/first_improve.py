@@ -17,7 +17,7 @@ logging = load_logger(__name__)
 
 
 def try_improvement(sol: Solution, objective: int, improvement_criteria: str,
-                    switch: list = [1, 1]) -> bool:
+                    switch: list = [1, 1], stats: dict = None) -> bool:
     '''Attempts to improve a solution by selecting and interchanging a selected element (node)
     with an unselected element. The improvement is obtained if the new solution dominates the
     previous solution.
@@ -33,6 +33,8 @@ def try_improvement(sol: Solution, objective: int, improvement_criteria: str,
     element defines how many nodes will be removed from the solution and the second element
     determines the number of nodes that will be added to the solution. Defaults to [1, 1] for
     a standard 1-1 exchange.
+      stats (dict): optional neighborhood statistics, whose `moves` counter is increased with the
+    number of exchanges evaluated.
 
     Returns:
       (bool): `True` if the improvement was successful (i.e., if the objective values are
@@ -68,6 +70,7 @@ def try_improvement(sol: Solution, objective: int, improvement_criteria: str,
                                                                      [u[2] for u
                                                                       in combo_u])) > sol.of_MaxMin]
 
+    moves = 0
     # For all the possible combinations between the selected elements
     for combo_s in selected_combinations:
         nodes_s = [s[2] for s in combo_s]  # Get node IDs
@@ -78,6 +81,7 @@ def try_improvement(sol: Solution, objective: int, improvement_criteria: str,
         d_min_s = [s[1] for s in combo_s]  # + pairwise_d
         # For all the possible combinations between the unselected elements
         for combo_u in unselected_combinations:
+            moves += 1
             nodes_u = [u[2] for u in combo_u]  # Get node IDs
             # If the constraints are not met with the new combo, try new exchange
             if not (sol.satisfies_cost(nodes_u, nodes_s)
@@ -113,7 +117,11 @@ def try_improvement(sol: Solution, objective: int, improvement_criteria: str,
                 for u in nodes_u:
                     sol.add_to_solution(u)
 
+                if stats is not None:
+                    stats['moves'] += moves
                 return True
+    if stats is not None:
+        stats['moves'] += moves
     return False
 
 
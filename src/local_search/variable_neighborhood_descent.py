@@ -1,6 +1,8 @@
 '''
 Auxiliar function to apply Variable Neighborhood Descent.
 '''
+import time
+
 from local_search import best_improve as bes
 from local_search import fast_improve as fas
 from local_search import first_improve as fis
@@ -13,8 +15,13 @@ logging = load_logger(__name__)
 OBJECTIVE_FUNCTIONS = {0: 'MaxSum',
                        1: 'MaxMin'}
 
+# Adaptive neighborhood ordering parameters
+MIN_CALLS = 10  # Explorations of a neighborhood before its statistics are trusted
+MIN_SUCCESS_RATE = 0.01  # Neighborhoods with a lower improvement rate are skipped
+EXPLORATION_PERIOD = 20  # Every EXPLORATION_PERIOD LS runs skipped neighborhoods are explored
+
 
-def improve(sol: Solution, config: dict):
+def improve(sol: Solution, config: dict, nb_stats: dict = None):
     '''Iteratively tries to improve a solution until no further improvements can be made.
 
     Args:
@@ -24,8 +31,12 @@ def improve(sol: Solution, config: dict):
     it contains a 'strategy' key that indicates if a Variable Neighborhood Descent strategy will be
     used or a standar Local Search. If the 'strategy' is 'VND', it contains another 'neighborhoods'
     key with a dict value that contains the exchange list [n_nodes_out, n_nodes_in] for each
-    explored neighborhood. Finally, the 'scheme' key indicated if a First, Best or Fast approach
-    will be used to make the improvement.
+    explored neighborhood, and an optional 'neighborhood_order' key that indicates if the
+    neighborhoods are explored in the 'Fixed' order of the config file or in an 'Adaptive' order.
+    Finally, the 'scheme' key indicated if a First, Best or Fast approach will be used to make the
+    improvement.
+      nb_stats (dict): statistics of each neighborhood (see `create_neighborhood_stats`), updated
+    with the results of this local search. It is required by the 'Adaptive' order.
     '''
     # Get config parammeters
     ls_scheme = config.get('scheme')
@@ -37,12 +48,23 @@ def improve(sol: Solution, config: dict):
     max_time = config.get('execution_limits').get('max_local_search_time')
     max_it = config.get('execution_limits').get('max_local_search_it')
 
+    if nb_stats is None:
+        nb_stats = create_neighborhood_stats(neighborhoods)
+    elif len(nb_stats) == 0:
+        nb_stats.update(create_neighborhood_stats(neighborhoods))
+
+    # Order in which the neighborhoods are explored
+    if config.get('neighborhood_order') == 'Adaptive':
+        order = adaptive_neighborhood_order(nb_stats)
+    else:
+        order = list(neighborhoods)
+
     nb = 1  # Initialize with first neighborhood
     count = 0
     abs_count = 0
     improve = True
     # Run improvement loop while solution is being improved in any neighborhood
-    while (improve or nb <= len(neighborhoods)) and abs_count < max_it:
+    while (improve or nb <= len(order)) and abs_count < max_it:
         objective = abs_count % 2  # 0: MaxSum, 1: MaxMin (for Alt approach)
         # Check if a single objective approach is selected
         mo_approach = config.get('mo_approach_LS')
@@ -52,22 +74,105 @@ def improve(sol: Solution, config: dict):
             objective = 1
 
         # Get exchange list of current neighborhood [n_nodes_out, n_nodes_in]
-        switch = neighborhoods[nb]
-        print('Local searching in neighbourhood %s with switch type %s and %s objective.',
-              nb, switch, 'Dom' if mo_approach == 'Dom' else OBJECTIVE_FUNCTIONS.get(objective))
+        stats = nb_stats[order[nb-1]]
+        switch = neighborhoods[order[nb-1]]
+        if __debug__:  # Per-step message, compiled out with python -O
+            logging.debug('Local searching in neighbourhood %s with switch type %s and %s '
+                          'objective.', order[nb-1], switch,
+                          'Dom' if mo_approach == 'Dom' else OBJECTIVE_FUNCTIONS.get(objective))
+        start = time.perf_counter()
         if ls_scheme == 'Best':
-            improve = bes.try_improvement(sol, switch=switch, max_time=max_time)
+            improve = bes.try_improvement(sol, switch=switch, max_time=max_time, stats=stats)
         elif ls_scheme == 'Fast':
-            improve = fas.try_improvement(sol, switch)
+            improve = fas.try_improvement(sol, switch, stats=stats)
         elif ls_scheme == 'First':
-            improve = fis.try_improvement(sol, objective, mo_approach, switch)
+            improve = fis.try_improvement(sol, objective, mo_approach, switch, stats=stats)
+        stats['time'] += time.perf_counter() - start
+        stats['calls'] += 1
         if improve:
-            print('Improved solution.')
+            stats['improvements'] += 1
             nb = 1  # Go back to first neighborhood
         else:
-            print('Unable to improve solution. Change neighborhood.')
             count += 1
             nb += 1  # Change to next neighborhood
+        if __debug__:
+            logging.debug('Improved solution.' if improve
+                          else 'Unable to improve solution. Change neighborhood.')
         abs_count += 1
-    print('Local search stopped with %s total IT and %s IT with no improvements.',
-          abs_count, count)
+    logging.debug('Local search stopped with %s total IT and %s IT with no improvements.',
+                  abs_count, count)
+
+
+def create_neighborhood_stats(neighborhoods: dict) -> dict:
+    '''Initializes the statistics tracked for each neighborhood explored in the local search.
+
+    Args:
+      neighborhoods (dict): contains the exchange list [n_nodes_out, n_nodes_in] of each
+    neighborhood.
+
+    Returns:
+      (dict): for each neighborhood, the exchange list `switch`, the number of times it has been
+    explored `calls`, the number of `improvements` found, the number of `moves` evaluated, the
+    total `time` spent in seconds, and the number of local searches in which it was `skipped`.
+    '''
+    return {nb: {'switch': switch, 'calls': 0, 'improvements': 0, 'moves': 0, 'time': 0.0,
+                 'skipped': 0, 'runs': 0}
+            for nb, switch in neighborhoods.items()}
+
+
+def adaptive_neighborhood_order(nb_stats: dict) -> list:
+    '''Sorts the neighborhoods by the number of improvements found per second of local search,
+    so the most profitable neighborhoods are explored first. Neighborhoods that have not been
+    explored enough times are explored first to gather their statistics, and neighborhoods with an
+    improvement rate below `MIN_SUCCESS_RATE` are skipped, except once every `EXPLORATION_PERIOD`
+    local searches to update their statistics.
+
+    Args:
+      nb_stats (dict): statistics of each neighborhood (see `create_neighborhood_stats`).
+
+    Returns:
+      (list): IDs of the neighborhoods to be explored, in order.
+    '''
+    order = []
+    for nb, stats in nb_stats.items():
+        stats['runs'] += 1
+        if stats['calls'] < MIN_CALLS:
+            score = float('inf')
+        elif (stats['improvements'] / stats['calls'] < MIN_SUCCESS_RATE
+              and stats['runs'] % EXPLORATION_PERIOD != 0):
+            stats['skipped'] += 1
+            continue
+        else:
+            score = stats['improvements'] / max(stats['time'], 1e-9)
+        order.append((score, nb))
+
+    # Never skip all the neighborhoods, keep the one with the highest improvement rate
+    if len(order) == 0:
+        nb = max(nb_stats, key=lambda k: nb_stats[k]['improvements'] / nb_stats[k]['calls'])
+        nb_stats[nb]['skipped'] -= 1
+        order.append((0, nb))
+
+    order.sort(key=lambda item: -item[0])
+
+    return [nb for _, nb in order]
+
+
+def neighborhood_summary(nb_stats: dict) -> dict:
+    '''Summarizes the neighborhood statistics in a flat dictionary to be saved with the rest of
+    the execution data.
+
+    Args:
+      nb_stats (dict): statistics of each neighborhood (see `create_neighborhood_stats`).
+
+    Returns:
+      (dict): one key per neighborhood and statistic, named as `nb_<out>-<in>_<statistic>`.
+    '''
+    summary = {}
+    for stats in nb_stats.values():
+        name = f'nb_{stats["switch"][0]}-{stats["switch"][1]}'
+        summary[f'{name}_calls'] = [stats['calls']]
+        summary[f'{name}_improvements'] = [stats['improvements']]
+        summary[f'{name}_moves'] = [stats['moves']]
+        summary[f'{name}_time'] = [round(stats['time'], 2)]
+        summary[f'{name}_skipped'] = [stats['skipped']]
+    return summary
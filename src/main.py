@@ -1,10 +1,12 @@
 '''Main function'''
+import argparse
 import os
 import random
 
-from utils import execution
+from utils import checkpoint, execution, plots, profiler, scheduler
 from utils.config import read_config
-from utils.logger import load_logger
+from utils.logger import load_logger, set_level
+from utils.results import OutputHandler
 
 logging = load_logger(__name__)
 
@@ -14,13 +16,57 @@ config_list = read_config('config')
 random.seed(42)
 
 if __name__ == '__main__':
-    print('Initializing diversity maximization algorithm...')
+    parser = argparse.ArgumentParser(description='B-GRASP with VND for the BOGDP')
+    parser.add_argument('--path', default=os.path.join('instances', 'GDP', 'GKD-b_n50'),
+                        help='directory with the instances to be solved')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of processes running (config, instance, experiment) tasks')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip the completed tasks of the previous campaign and resume the '
+                             'partial ones from their checkpoints')
+    parser.add_argument('--plot', action='store_true',
+                        help='render the Pareto Front plots of the results in a background stage')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=profiler.PROFILERS,
+                        help='profile the execution of each instance with cProfile (default) or '
+                             'a sampling profiler, saving the profile next to its results')
+    parser.add_argument('--profile-top', type=int, default=20,
+                        help='number of functions in the summary of each profile')
+    parser.add_argument('--quiet', action='store_true',
+                        help='only log warnings and errors')
+    args = parser.parse_args()
+    if args.quiet:
+        set_level('WARNING')
 
-    path = os.path.join('instances', 'GDP', 'GKD-b_n50')
+    logging.info('Initializing diversity maximization algorithm...')
 
-    for config in config_list:
-        # execution.execute_instance(path, config)
-        for n in range(config.get('experiments')):
-            execution.execute_directory(path, config)
+    if args.profile:
+        for config in config_list:
+            config['profile'] = args.profile
+            config['profile_top'] = args.profile_top
 
-        os.remove(os.path.join('temp', 'execution.txt'))
+    path = args.path
+    key = checkpoint.get_campaign_key(path, [execution.get_algorithm_params(config)
+                                             for config in config_list])
+    manifest = checkpoint.CampaignManifest(resume=args.resume, key=key)
+
+    # Plots are rendered from the saved results, off the solver processes
+    render_stage = None
+    if args.plot or any(config.get('plot') for config in config_list):
+        output_dirs = [OutputHandler.get_output_path(execution.get_algorithm_params(config), path)
+                       for config in config_list]
+        render_stage = plots.RenderStage(output_dirs)
+        render_stage.start()
+
+    try:
+        if args.workers > 1:
+            tasks = scheduler.create_tasks(path, config_list, manifest=manifest)
+            scheduler.execute_tasks(tasks, args.workers, manifest)
+        else:
+            for config in config_list:
+                # execution.execute_instance(path, config)
+                for n in range(config.get('experiments')):
+                    execution.execute_directory(path, config, n, manifest)
+    finally:
+        # The render process is stopped even if the solver fails
+        if render_stage is not None:
+            render_stage.stop()
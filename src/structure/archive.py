@@ -0,0 +1,124 @@
+'''Auxiliar class to handle the archive of non-dominated solutions'''
+import bisect
+
+from structure.solution import Solution
+
+
+class ParetoArchive:
+    '''Archive of bi-objective (MaxSum, MaxMin) non-dominated solutions. The solutions are kept
+    sorted by increasing MaxMin, so MaxSum is non-increasing along the archive and both the
+    dominance check and the search of the dominated solutions are binary searches.'''
+    def __init__(self, max_size: int = None):
+        '''Initialize ParetoArchive
+
+        Args:
+          max_size (int): maximum number of solutions in the archive. If it is exceeded, the
+        solution with the lowest crowding distance is removed. Defaults to None (unbounded).
+        '''
+        self.maxmin = []  # MaxMin values (sorted in increasing order)
+        self.maxsum = []  # MaxSum values (non-increasing order)
+        self.solutions = []
+        self.max_size = max_size if max_size else None
+
+    def __len__(self) -> int:
+        return len(self.solutions)
+
+    def __iter__(self):
+        return iter(self.solutions)
+
+    def is_dominated(self, maxsum: float, maxmin: float) -> bool:
+        '''Checks if a point (MaxSum, MaxMin) is dominated by any solution in the archive. A
+        point is dominated if another one is no worse in all objectives and better in at least one.
+
+        Args:
+          maxsum (float): MaxSum value of the point.
+          maxmin (float): MaxMin value of the point.
+
+        Returns:
+          (bool): indicates whether the point is dominated by the archive.
+        '''
+        # The solution with the highest MaxSum among the ones with a MaxMin no worse than `maxmin`
+        idx = bisect.bisect_left(self.maxmin, maxmin)
+        if idx == len(self.solutions):
+            return False
+
+        return (self.maxsum[idx] >= maxsum
+                and (self.maxsum[idx] > maxsum or self.maxmin[idx] > maxmin))
+
+    def insert(self, sol: Solution) -> bool:
+        '''Inserts a solution in the archive if it is not dominated, removing the solutions
+        dominated by the new one. Solutions with identical objective values do not dominate each
+        other, so all of them are kept.
+
+        Args:
+          sol (Solution): contains the solution information.
+
+        Returns:
+          (bool): indicates whether the solution has been added to the archive.
+        '''
+        maxsum, maxmin = sol.of_MaxSum, sol.of_MaxMin
+        if self.is_dominated(maxsum, maxmin):
+            return False
+
+        # The solutions dominated by `sol` are a contiguous run just before the first solution
+        # with a higher MaxMin
+        end = bisect.bisect_right(self.maxmin, maxmin)
+        start = end
+        if not (start > 0 and self.maxmin[start-1] == maxmin and self.maxsum[start-1] == maxsum):
+            while start > 0 and self.maxsum[start-1] <= maxsum:
+                start -= 1
+        del self.maxmin[start:end]
+        del self.maxsum[start:end]
+        del self.solutions[start:end]
+
+        self.maxmin.insert(start, maxmin)
+        self.maxsum.insert(start, maxsum)
+        self.solutions.insert(start, sol)
+
+        if self.max_size is not None and len(self.solutions) > self.max_size:
+            return self._prune() != start
+        return True
+
+    def hypervolume(self, reference: tuple = (0, 0)) -> float:
+        '''Calculates the area dominated by the archive and bounded by a reference point
+        (MaxSum, MaxMin), in a single pass over the solutions sorted by MaxMin.
+
+        Args:
+          reference (tuple): reference point (MaxSum, MaxMin), dominated by every solution.
+
+        Returns:
+          (float): hypervolume of the archive.
+        '''
+        area = 0
+        previous_maxmin = reference[1]
+        for maxsum, maxmin in zip(self.maxsum, self.maxmin):
+            if maxmin > previous_maxmin and maxsum > reference[0]:
+                area += (maxsum - reference[0]) * (maxmin - previous_maxmin)
+                previous_maxmin = maxmin
+        return area
+
+    def _prune(self) -> int:
+        '''Removes the solution with the lowest crowding distance from the archive. The extreme
+        solutions of the front are never removed.
+
+        Returns:
+          (int): the position of the removed solution.
+        '''
+        n = len(self.solutions)
+        range_maxmin = (self.maxmin[-1] - self.maxmin[0]) or 1
+        range_maxsum = (self.maxsum[0] - self.maxsum[-1]) or 1
+
+        worst = 1 if n > 2 else n - 1
+        worst_distance = float('inf')
+        for i in range(1, n-1):
+            distance = ((self.maxmin[i+1] - self.maxmin[i-1]) / range_maxmin
+                        + (self.maxsum[i-1] - self.maxsum[i+1]) / range_maxsum)
+            if distance < worst_distance:
+                worst = i
+                worst_distance = distance
+
+        del self.maxmin[worst]
+        del self.maxsum[worst]
+        del self.solutions[worst]
+
+        return worst
@@ -64,11 +64,45 @@ def get_nondominated_solutions(all_solutions: list) -> list:
       (list of bool): each value indicates whether the corresponding solution in the input list
     `all_solutions` is non-dominated by any other solution in the list.
     '''
-    is_non_dominated = [True] * len(all_solutions)
-    for i, sol_i in enumerate(all_solutions):
-        for j, sol_j in enumerate(all_solutions):
-            if i != j and solution_is_dominant(sol_j, sol_i):
+    return get_nondominated_mask([(sol.of_MaxSum, sol.of_MaxMin) for sol in all_solutions])
+
+
+def get_nondominated_mask(points: list) -> list:
+    '''
+    Identifies non-dominated points within a list of bi-objective (MaxSum, MaxMin) points, both
+    objectives being maximized. The points are sorted by decreasing MaxSum and swept keeping the
+    best MaxMin seen so far, so the complexity is O(N log N) instead of the O(N^2) pairwise
+    comparison. Points with identical objective values do not dominate each other, so all of them
+    are kept if they are not dominated by another point.
+
+    Args:
+      points (list): objective function values (MaxSum, MaxMin) of each solution.
+
+    Returns:
+      (list of bool): each value indicates whether the corresponding point in the input list
+    `points` is non-dominated by any other point in the list.
+    '''
+    is_non_dominated = [True] * len(points)
+    order = sorted(range(len(points)), key=lambda i: -points[i][0])
+
+    best_maxmin = float('-inf')  # Best MaxMin among points with a strictly higher MaxSum
+    start = 0
+    while start < len(order):
+        # Group of points with the same MaxSum value
+        maxsum = points[order[start]][0]
+        end = start
+        while end < len(order) and points[order[end]][0] == maxsum:
+            end += 1
+        group = order[start:end]
+        group_maxmin = max(points[i][1] for i in group)
+
+        for i in group:
+            # Dominated by a point with higher MaxSum and no worse MaxMin, or by a point with the
+            # same MaxSum and higher MaxMin
+            if best_maxmin >= points[i][1] or group_maxmin > points[i][1]:
                 is_non_dominated[i] = False
-                break
+
+        best_maxmin = max(best_maxmin, group_maxmin)
+        start = end
 
     return is_non_dominated
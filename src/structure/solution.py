@@ -1,4 +1,7 @@
 '''Auxiliar class to handle candidate solutions'''
+import random
+
+ZOBRIST_KEYS = {}  # Random 64-bit key of each node, for each instance size
 
 
 class Solution:
@@ -11,6 +14,33 @@ class Solution:
         self.total_cost = 0
         self.total_capacity = 0
         self.instance = instance
+        self.node_hash = 0  # Zobrist hash of solution_set
+        self.zobrist_keys = get_zobrist_keys(instance['n'])
+
+    def __deepcopy__(self, memo: dict):
+        '''Copies the solution sharing the instance data, which is never modified, instead of
+        duplicating the distance matrix in every copy.'''
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new.solution_set = set(self.solution_set)
+        return new
+
+    def __getstate__(self) -> dict:
+        '''Pickles the solution without the instance data, so solutions can be sent between
+        processes cheaply. The instance must be set again with `set_instance` after unpickling.'''
+        state = self.__dict__.copy()
+        state['instance'] = None
+        state['zobrist_keys'] = None
+        return state
+
+    def set_instance(self, instance: dict):
+        '''Sets the instance data of a solution that has been unpickled.
+
+        Args:
+          instance (dict): contains the instance data.
+        '''
+        self.instance = instance
+        self.zobrist_keys = get_zobrist_keys(instance['n'])
 
     def add_to_solution(self, u: int, min_distance: float = -1, sum_variation: float = -1):
         '''Updates a solution by adding a specified element and its corresponding value to the
@@ -39,6 +69,7 @@ class Solution:
         self.total_cost += self.instance['a'][u]
         self.total_capacity += self.instance['c'][u]
         self.solution_set.add(u)
+        self.node_hash ^= self.zobrist_keys[u]
 
     def remove_from_solution(self, u: int, min_distance: float = -1, sum_variation: float = -1):
         '''Removes an element from a solution and updates the objective function value accordingly.
@@ -53,6 +84,7 @@ class Solution:
         solution.
         '''
         self.solution_set.remove(u)
+        self.node_hash ^= self.zobrist_keys[u]
         if sum_variation == -1 or min_distance == -1:
             for s in self.solution_set:
                 distance_u_s = self.instance['d'][u][s]
@@ -197,3 +229,22 @@ class Solution:
                 possible_capacity += self.instance['c'][q]
 
         return possible_capacity > self.instance['B']
+
+
+def get_zobrist_keys(n: int) -> list:
+    '''Returns the random 64-bit keys used to compute the Zobrist hash of the solutions of an
+    instance with `n` nodes. The hash of a solution is the XOR of the keys of its selected nodes,
+    so it is updated in O(1) each time a node is added or removed and two solutions with the same
+    node set have the same hash. The keys are generated with an independent seeded generator, so
+    they are deterministic and do not alter the random sequence of the algorithm.
+
+    Args:
+      n (int): number of nodes of the instance.
+
+    Returns:
+      (list): the Zobrist key of each node.
+    '''
+    if n not in ZOBRIST_KEYS:
+        generator = random.Random(n)
+        ZOBRIST_KEYS[n] = [generator.getrandbits(64) for _ in range(n)]
+    return ZOBRIST_KEYS[n]
@@ -0,0 +1,100 @@
+'''Auxiliar class to accumulate the records of the solutions found in an execution'''
+from array import array
+from typing import TYPE_CHECKING
+
+from structure.solution import Solution
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+COLUMNS = ['Solution', 'MaxSum', 'MaxMin', 'Cost', 'Capacity']
+
+
+class SolutionTable:
+    '''Columnar table of solution records. The objective values and the (integer) constraint
+    values are stored in preallocated arrays and the node sets as integer bitsets, so appending a
+    solution does not reallocate a DataFrame nor format its node list. The table is converted into
+    a DataFrame once, when it is written.'''
+    def __init__(self, capacity: int = 1024):
+        '''Initialize SolutionTable
+
+        Args:
+          capacity (int): number of records preallocated. The buffers are doubled when they are
+        full.
+        '''
+        self.size = 0
+        self.capacity = max(capacity, 1)
+        self.maxsum = array('d', bytes(8 * self.capacity))
+        self.maxmin = array('d', bytes(8 * self.capacity))
+        self.cost = array('q', bytes(8 * self.capacity))
+        self.total_capacity = array('q', bytes(8 * self.capacity))
+        self.nodes = [0] * self.capacity  # Bitset of the selected nodes of each solution
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, sol: Solution):
+        '''Adds the record of a solution to the table.
+
+        Args:
+          sol (Solution): contains the solution information.
+        '''
+        if self.size == self.capacity:
+            self._grow()
+
+        i = self.size
+        self.maxsum[i] = sol.of_MaxSum
+        self.maxmin[i] = sol.of_MaxMin
+        self.cost[i] = sol.total_cost
+        self.total_capacity[i] = sol.total_capacity
+        bitset = 0
+        for u in sol.solution_set:
+            bitset |= 1 << u
+        self.nodes[i] = bitset
+        self.size += 1
+
+    def extend(self, solution_list: list):
+        '''Adds the records of a list of solutions to the table.
+
+        Args:
+          solution_list (list): solutions (Solution instances) to be added.
+        '''
+        for sol in solution_list:
+            self.append(sol)
+
+    def to_dataframe(self) -> 'pd.DataFrame':
+        '''Converts the table into a DataFrame with the node list of each solution formatted as
+        `"1 - 5 - 9"`. pandas is only imported when a table is converted.
+
+        Returns:
+          (pd.DataFrame): contains solution data.
+        '''
+        import pandas as pd
+
+        n = self.size
+        return pd.DataFrame({'Solution': [format_nodes(b) for b in self.nodes[:n]],
+                             'MaxSum': self.maxsum[:n].tolist(),
+                             'MaxMin': self.maxmin[:n].tolist(),
+                             'Cost': self.cost[:n].tolist(),
+                             'Capacity': self.total_capacity[:n].tolist()},
+                            columns=COLUMNS)
+
+    def _grow(self):
+        '''Doubles the capacity of the buffers.'''
+        for buffer in (self.maxsum, self.maxmin, self.cost, self.total_capacity):
+            buffer.frombytes(bytes(8 * self.capacity))
+        self.nodes.extend([0] * self.capacity)
+        self.capacity *= 2
+
+
+def format_nodes(bitset: int) -> str:
+    '''Formats the node set of a bitset as a sorted node list `"1 - 5 - 9"`.
+
+    Args:
+      bitset (int): bitset of the selected nodes.
+
+    Returns:
+      (str): sorted list of the selected nodes.
+    '''
+    bits = bin(bitset)[:1:-1]  # Bits from the lowest node
+    return ' - '.join([str(u) for u, bit in enumerate(bits) if bit == '1'])
@@ -0,0 +1,211 @@
+'''Functions and class to checkpoint and resume long executions'''
+import glob
+import hashlib
+import json
+import os
+import pickle
+import random
+
+from utils.results import OutputHandler
+from utils.logger import load_logger
+
+logging = load_logger(__name__)
+
+CHECKPOINT_DIR = os.path.join('temp', 'checkpoints')
+MANIFEST_DIR = os.path.join('temp', 'manifests')
+
+
+def get_campaign_key(directory: str, params_list: list) -> str:
+    '''
+    Builds the key of a campaign from its instance directory and algorithm configurations, so
+    the campaigns launched on the same output tree keep separate manifests.
+
+    Args:
+      directory (str): represents the path to the directory where the files (instances) are located.
+      params_list (list): name of each algorithm configuration of the campaign.
+
+    Returns:
+      (str): key of the campaign.
+    '''
+    campaign = json.dumps([os.path.normpath(directory), sorted(params_list)])
+    return hashlib.sha1(campaign.encode()).hexdigest()[:12]
+
+
+def get_manifest_path(key: str) -> str:
+    '''Builds the path of the manifest file of a campaign.'''
+    return os.path.join(MANIFEST_DIR, f'manifest_{key}.json')
+
+
+def get_checkpoint_path(params: str, instance: str, execution_n: int) -> str:
+    '''
+    Builds the path of the checkpoint file of an execution of an instance.
+
+    Args:
+      params (str): parameter configuration used in the optimization algorithm.
+      instance (str): represents the name or path of a specific file (instance).
+      execution_n (int): execution number.
+
+    Returns:
+      (str): path of the checkpoint file.
+    '''
+    instance_path = instance.split(os.sep)[1:]
+    instance_path = [s.replace('.txt', '') for s in instance_path]
+    return os.path.join(CHECKPOINT_DIR, f'B-GRASP_{params}', *instance_path,
+                        f'checkpoint_{execution_n}.pkl')
+
+
+def save_checkpoint(path: str, state: dict):
+    '''
+    Saves the state of an execution in a checkpoint file. The file is written in a temporary file
+    that replaces the previous checkpoint, so a checkpoint is never left half written.
+
+    Args:
+      path (str): path of the checkpoint file.
+      state (dict): state of the execution.
+    '''
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f'{path}.tmp', 'wb') as file:
+        pickle.dump(state, file)
+    os.replace(f'{path}.tmp', path)
+
+
+def load_checkpoint(path: str, inst: dict) -> dict:
+    '''
+    Loads the state of an execution from its checkpoint file, if it exists.
+
+    Args:
+      path (str): path of the checkpoint file.
+      inst (dict): contains the instance data, which is set again in the saved solutions.
+
+    Returns:
+      (dict): state of the execution, or None if there is no checkpoint.
+    '''
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as file:
+        state = pickle.load(file)
+
+    for sol in state['archive']:
+        sol.set_instance(inst)
+    if state['memo'] is not None:
+        for sol in state['memo'].memo.values():
+            sol.set_instance(inst)
+
+    logging.info('Resuming execution from %s (%s iterations completed).',
+                 path, len(state['completed']))
+
+    return state
+
+
+def remove_checkpoint(path: str):
+    '''
+    Removes the checkpoint file of a finished execution.
+
+    Args:
+      path (str): path of the checkpoint file.
+    '''
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def remove_checkpoints(manifest: dict):
+    '''
+    Removes the checkpoint files of the executions recorded in the manifest of a campaign.
+
+    Args:
+      manifest (dict): manifest of the campaign.
+    '''
+    for key, execution_n in manifest['executions'].items():
+        params = key.split('|')[0]
+        pattern = os.path.join(glob.escape(os.path.join(CHECKPOINT_DIR, f'B-GRASP_{params}')),
+                               '**', f'checkpoint_{execution_n}.pkl')
+        for path in glob.glob(pattern, recursive=True):
+            os.remove(path)
+
+
+class CampaignManifest:
+    '''Class to record the execution number of each (config, experiment) and the completed
+    (config, instance, experiment) tasks of a campaign, so a restarted campaign skips the finished
+    tasks and resumes the partial ones with the same execution number. The random state after the
+    last completed task is also recorded, so the sequential execution continues with the same
+    random sequence. Each campaign (instance directory and configurations) has its own manifest,
+    so other campaigns running on the same output tree are not affected'''
+    def __init__(self, resume: bool = False, key: str = 'default'):
+        '''Initialize CampaignManifest
+
+        Args:
+          resume (bool): if True, the manifest of the previous run of the campaign is loaded.
+        Otherwise, a new run is started and the manifest and checkpoints of the previous run of
+        the campaign are removed.
+          key (str): key of the campaign (see `get_campaign_key`).
+        '''
+        self.path = get_manifest_path(key)
+        self.manifest = {'executions': {}, 'completed': []}
+
+        if resume and os.path.exists(self.path):
+            with open(self.path, 'r') as file:
+                self.manifest = json.load(file)
+            logging.info('Resuming campaign with %s completed tasks.',
+                         len(self.manifest['completed']))
+        elif not resume and os.path.exists(self.path):
+            with open(self.path, 'r') as file:
+                remove_checkpoints(json.load(file))
+            os.remove(self.path)
+        self.completed = set(self.manifest['completed'])
+        self.restore_pending = 'random_state' in self.manifest
+
+    def create_output_handler(self, params: str, experiment: int) -> OutputHandler:
+        '''
+        Creates the OutputHandler of an experiment of a configuration, with the execution number
+        recorded in the manifest or with a new execution number not used by the configuration.
+
+        Args:
+          params (str): parameter configuration used in the optimization algorithm.
+          experiment (int): number of the experiment.
+
+        Returns:
+          (OutputHandler): handler with the execution number of the experiment.
+        '''
+        key = f'{params}|{experiment}'
+        if key in self.manifest['executions']:
+            return OutputHandler(self.manifest['executions'][key])
+
+        used = {n for k, n in self.manifest['executions'].items()
+                if k.split('|')[0] == params}
+        results = OutputHandler()
+        while int(results.execution_n) in used:
+            results = OutputHandler()
+        self.manifest['executions'][key] = int(results.execution_n)
+        self._save()
+
+        return results
+
+    def is_completed(self, params: str, instance: str, experiment: int) -> bool:
+        '''Checks if the task (config, instance, experiment) has been completed.'''
+        return f'{params}|{instance}|{experiment}' in self.completed
+
+    def complete(self, params: str, instance: str, experiment: int):
+        '''Records the task (config, instance, experiment) as completed.'''
+        key = f'{params}|{instance}|{experiment}'
+        self.completed.add(key)
+        self.manifest['completed'].append(key)
+        self.manifest['random_state'] = random.getstate()
+        self._save()
+
+    def restore_random_state(self):
+        '''Restores the random state after the last completed task of the previous campaign, only
+        before the first task executed in a resumed campaign.'''
+        if self.restore_pending:
+            version, state, gauss = self.manifest['random_state']
+            random.setstate((version, tuple(state), gauss))
+            self.restore_pending = False
+
+    def _save(self):
+        '''
+        Writes the manifest in a temporary file that replaces the previous manifest.
+        '''
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f'{self.path}.tmp', 'w') as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(f'{self.path}.tmp', self.path)
@@ -1,16 +1,32 @@
 '''Directory and instance execution auxiliar functions'''
 import datetime
 import os
-import pandas as pd
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 
-from algorithms import grasp
-from structure import instance, dominance
+from algorithms import grasp, path_relinking
+from local_search import variable_neighborhood_descent
+from structure import instance
+from structure.archive import ParetoArchive
+from structure.table import SolutionTable
 
+from utils import checkpoint, instrumentation, profiler
 from utils.results import OutputHandler
 from utils.logger import load_logger
 
 logging = load_logger(__name__)
 
+# Instance data and GRASP state of each worker process in the parallel execution
+WORKER_STATE = {}
+
+# State of an execution saved in its checkpoints (together with the random state)
+CHECKPOINT_KEYS = ['archive', 'n_solutions', 'duplicates', 'memo', 'nb_stats', 'c_result_table',
+                   'result_table', 'completed', 'base_seed', 'elapsed']
+
+# Reference point (MaxSum, MaxMin) of the hypervolume of the anytime trace, as in the evaluation
+TRACE_REFERENCE = (0, 0)
+
 
 def execute_instance(path: str, config: dict, results: OutputHandler) -> float:
     '''
@@ -28,85 +44,453 @@ def execute_instance(path: str, config: dict, results: OutputHandler) -> float:
     Returns:
       (float): returns the total execution time in seconds.
     '''
-    # Initialize list and table to save solutions
-    all_c_solutions = []  # Solutions from construction stage
-    all_solutions = []  # Final solutions after the LS stage
-    c_result_table = pd.DataFrame(columns=['Solution', 'MaxSum', 'MaxMin', 'Cost', 'Capacity'])
-    result_table = pd.DataFrame(columns=['Solution', 'MaxSum', 'MaxMin', 'Cost', 'Capacity'])
+    # Initialize archive and tables to save solutions
+    max_archive_size = config.get('execution_limits').get('max_archive_size')
+    archive = ParetoArchive(max_archive_size)  # Non-dominated solutions after the LS stage
+    n_solutions = 0  # Number of solutions found after the LS stage
+    # Node set hashes of the solutions already found (and of the LS starts, used when the memo is
+    # disabled), and counters of the duplicates skipped
+    duplicates = {'solutions': set(), 'sols_skipped': 0, 'ls_starts': set(), 'ls_skipped': 0}
+    # Memo with the results of the local searches
+    ls_memo_size = config.get('execution_limits').get('ls_memo_size')
+    memo = grasp.LocalSearchMemo(ls_memo_size) if ls_memo_size else None
+    nb_stats = {}  # Statistics of the neighborhoods explored in the LS
+    # The constructed and improved solutions are only kept if they are saved, so otherwise the
+    # memory of a long execution is bounded by the archive
+    c_result_table, result_table = None, None
+    if config.get('save_all_solutions'):
+        c_result_table = SolutionTable(config.get('iterations'))
+        result_table = SolutionTable(config.get('iterations'))
+
+    completed = set()  # Iterations already finished
+    # Time, completed iterations, hypervolume and size of the archive each time it changes
+    trace = []
+    workers = config.get('workers') or 1
+    base_seed = random.getrandbits(32) if workers > 1 else None  # Seed of the parallel IT
+    # Time per phase and counters of this execution
+    instrumentation.enable(bool(config.get('instrumentation')))
+    instrumentation.reset()
 
-    print('Solving instance %s:', path)
+    logging.info('Solving instance %s:', path)
     # Read instance
-    inst = instance.read_instance(path)
+    with instrumentation.timer('instance_loading'):
+        inst = instance.read_instance(path)
 
-    max_time = config.get('execution_limits').get('max_time')
-    start = datetime.datetime.now()
+    # Resume the execution from its last checkpoint, if any
+    algorithm_params = get_algorithm_params(config)
+    checkpoint_path = checkpoint.get_checkpoint_path(algorithm_params, path, results.execution_n)
+    checkpoint_time = config.get('checkpoint_time')
+    elapsed = 0
+    state = checkpoint.load_checkpoint(checkpoint_path, inst)
+    if state is not None:
+        (archive, n_solutions, duplicates, memo, nb_stats, c_result_table, result_table,
+         completed, base_seed, elapsed) = (state[key] for key in CHECKPOINT_KEYS)
+        random.setstate(state['random_state'])
+        if 'instrumentation' in state:
+            instrumentation.merge(state['instrumentation'])
+        trace = state.get('trace', [])
+    last_checkpoint = time.time()
+
+    start = datetime.datetime.now() - datetime.timedelta(seconds=elapsed)
     # Construct a solution for the IT defined in config
-    for i in range(config.get('iterations')):
-        # If time is exceeded stop execution
-        if datetime.timedelta(seconds=max_time) < datetime.datetime.now() - start:
-            print('Maximum allowed execution time is exceeded. Total IT: %s', i)
-            break
+    if workers > 1:
+        iterations = execute_iterations_parallel(path, inst, config, start, nb_stats, memo,
+                                                 duplicates, workers, base_seed, completed)
+    else:
+        iterations = execute_iterations(inst, config, start, nb_stats, memo, duplicates,
+                                        completed)
+    for i, c_sol_list, solution_list in iterations:
+        # Discard solutions whose node set has already been found
+        with instrumentation.timer('dominance_filtering'):
+            n_solutions += len(solution_list)
+            solution_list = discard_duplicates(solution_list, duplicates)
 
-        # Define objective considered in this IT
-        construction_approach = config.get('mo_approach_C')
-        objective = i % 2  # 0: MaxSum, 1: MaxMin (for default AltBwC approach)
+            # Save non-dominated solutions found in this IT in the archive
+            archive_changed = False
+            for sol in solution_list:
+                archive_changed |= archive.insert(sol)
 
-        # Check if a single objective approach have been defined
-        if construction_approach == 'MaxSum':
-            objective = 0
-        elif construction_approach == 'MaxMin':
-            objective = 1
+        # Add new solutions to c_result_table and result_table
+        if result_table is not None:
+            c_result_table.extend(c_sol_list)
+            result_table.extend(solution_list)
 
-        # Run B-GRASP-VND
-        print(f'Finding solution #{i+1}')
-        c_sol_list, solution_list = grasp.execute(inst, config, objective, i)
-        # Save solution set found in this IT
-        all_c_solutions += c_sol_list
-        all_solutions += solution_list
+        # Save the state of the execution periodically
+        completed.add(i)
+        if archive_changed:
+            update_trace(trace, archive, start, len(completed))
+        if checkpoint_time and time.time() - last_checkpoint > checkpoint_time:
+            elapsed = (datetime.datetime.now() - start).total_seconds()
+            state = (archive, n_solutions, duplicates, memo, nb_stats, c_result_table,
+                     result_table, completed, base_seed, elapsed)
+            state = dict(zip(CHECKPOINT_KEYS, state))
+            state['random_state'] = random.getstate()
+            state['instrumentation'] = instrumentation.snapshot()
+            state['trace'] = trace
+            checkpoint.save_checkpoint(checkpoint_path, state)
+            last_checkpoint = time.time()
 
-        # Add new solutions to result_table
-        # for sol in solution_list:
-        for c_sol in c_sol_list:
-            selected_nodes = ' - '.join([str(s) for s in sorted(c_sol.solution_set)])
-            c_result_table.loc[len(c_result_table)] = [selected_nodes] + [c_sol.of_MaxSum,
-                                                                      c_sol.of_MaxMin,
-                                                                      c_sol.total_cost,
-                                                                      c_sol.total_capacity]
+    # Post-optimization stage: Path Relinking between non-dominated solutions
+    if config.get('path_relinking'):
+        with instrumentation.timer('path_relinking'):
+            pr_solutions = path_relinking.execute(list(archive))
+        with instrumentation.timer('dominance_filtering'):
+            n_solutions += len(pr_solutions)
+            pr_solutions = discard_duplicates(pr_solutions, duplicates)
+            archive_changed = False
+            for sol in pr_solutions:
+                archive_changed |= archive.insert(sol)
+        if archive_changed:
+            update_trace(trace, archive, start, len(completed))
 
         # Add new solutions to result_table
-        for sol in solution_list:
-            selected_nodes = ' - '.join([str(s) for s in sorted(sol.solution_set)])
-            result_table.loc[len(result_table)] = [selected_nodes] + [sol.of_MaxSum,
-                                                                      sol.of_MaxMin,
-                                                                      sol.total_cost,
-                                                                      sol.total_capacity]
+        if result_table is not None:
+            result_table.extend(pr_solutions)
 
-    # Find non-dominated solutions among all constructions
-    is_non_dominated = dominance.get_nondominated_solutions(all_solutions)
-    dom_result_table = result_table[is_non_dominated].reset_index(drop=True)
+    # Non-dominated solutions among all constructions
+    dom_result_table = [[' - '.join([str(s) for s in sorted(sol.solution_set)]),
+                         sol.of_MaxSum, sol.of_MaxMin, sol.total_cost, sol.total_capacity]
+                        for sol in archive]
 
     # Compute execution time
     elapsed = datetime.datetime.now() - start
     secs = round(elapsed.total_seconds(), 2)
-    print('Execution time: %s', secs)
+    logging.info('Execution time: %s', secs)
     add_data = {
         'time': [secs],
-        'all_sols': [len(all_solutions)],
-        'nd_sols': [len(dom_result_table)]
+        'all_sols': [n_solutions],
+        'nd_sols': [len(dom_result_table)],
+        'dup_ls_skipped': [duplicates['ls_skipped']],
+        'dup_sols_skipped': [duplicates['sols_skipped']],
+        'memo_hits': [memo.hits if memo else 0],
+        'memo_misses': [memo.misses if memo else 0]
     }
+    logging.info('Duplicates skipped: %s local searches and %s solutions.',
+                 duplicates['ls_skipped'], duplicates['sols_skipped'])
+    if memo is not None:
+        logging.info('Local search memo: %s hits and %s misses.', memo.hits, memo.misses)
+    add_data.update(variable_neighborhood_descent.neighborhood_summary(nb_stats))
+    for phase, phase_data in instrumentation.phases().items():
+        add_data[f'{phase}_time'] = [phase_data['time']]
+    for stats in nb_stats.values():
+        logging.info('Neighborhood %s: %s improvements in %s explorations (%s moves, %.2f s).',
+                     stats['switch'], stats['improvements'], stats['calls'], stats['moves'],
+                     stats['time'])
+
+    # Save table with results (the Pareto Front is plotted from it in the render stage)
+    results.save(dom_result_table, result_table, c_result_table, add_data, algorithm_params, path,
+                 config.get('output_format') or 'csv', bool(config.get('results_store')), trace)
+    if instrumentation.ENABLED:
+        results.save_profile(get_profile(path, algorithm_params, results, add_data, nb_stats),
+                             algorithm_params, path)
+    checkpoint.remove_checkpoint(checkpoint_path)
+
+
+def update_trace(trace: list, archive: ParetoArchive, start: datetime.datetime, iterations: int):
+    '''
+    Records the hypervolume of the archive after it has changed, if it is different from the last
+    one recorded in the trace.
+
+    Args:
+      trace (list): records [time, iterations, hypervolume, archive size] of the execution.
+      archive (ParetoArchive): non-dominated solutions found so far.
+      start (datetime.datetime): start time of the execution.
+      iterations (int): number of iterations completed.
+    '''
+    hypervolume = round(archive.hypervolume(TRACE_REFERENCE), 4)
+    if len(trace) == 0 or trace[-1][2] != hypervolume:
+        elapsed = (datetime.datetime.now() - start).total_seconds()
+        trace.append([round(elapsed, 4), iterations, hypervolume, len(archive)])
+
+
+def execute_instance_profiled(path: str, config: dict, results: OutputHandler):
+    '''
+    Executes an instance under the profiler set in the `profile` key of config (cprofile or
+    sampling), saving its profile `profile_<n>.prof` or `profile_<n>.collapsed` next to its
+    results. If no profiler is set, the instance is executed directly.
+
+    Args:
+      path (str): represents the path to the instance that needs to be solved.
+      config (dict): contains the configuration settings for the algorithm.
+      results (OutputHandler): output handler with the execution number.
+    '''
+    if not config.get('profile'):
+        execute_instance(path, config, results)
+        return
 
-    # Build and plot Pareto Front
-    fig = results.pareto_front(dom_result_table, path)
-    # Save table and plot with results
-    algorithm_params = (f'IT{config.get("iterations")}'
-                        f'_b{config.get("parameters").get("beta")}'
-                        f'_{config.get("scheme")[:3]}'
-                        # f'_nb{len(config.get("neighborhoods"))}'
-                        ).replace('.', '')
-    results.save(dom_result_table, result_table, c_result_table, add_data, fig, algorithm_params, path)
+    if (config.get('workers') or 1) > 1:
+        logging.warning('Only the main process is profiled, the iterations run by the workers '
+                        'are not included in the profile.')
+    output_path = results.get_output_path(get_algorithm_params(config), path)
+    profiler.profile_call(execute_instance, (path, config, results), output_path,
+                          f'profile_{results.execution_n}', config.get('profile'),
+                          config.get('profile_top') or 20)
 
 
-def execute_directory(directory: str, config: dict):
+def get_profile(path: str, params: str, results: OutputHandler, add_data: dict,
+                nb_stats: dict) -> dict:
+    '''
+    Builds the profile of an execution with the time per phase, the counters and the statistics
+    of each neighborhood.
+
+    Args:
+      path (str): represents the path to the instance solved.
+      params (str): parameter configuration used in the optimization algorithm.
+      results (OutputHandler): output handler with the execution number.
+      add_data (dict): additional data of the execution.
+      nb_stats (dict): statistics of each neighborhood explored in the local search.
+
+    Returns:
+      (dict): profile of the execution.
+    '''
+    counters = dict(instrumentation.COUNTERS)
+    for key in ['all_sols', 'nd_sols', 'dup_ls_skipped', 'dup_sols_skipped', 'memo_hits',
+                'memo_misses']:
+        counters[key] = add_data[key][0]
+    counters['moves'] = sum(stats['moves'] for stats in nb_stats.values())
+    counters['improvements'] = sum(stats['improvements'] for stats in nb_stats.values())
+
+    return {'instance': path,
+            'params': params,
+            'execution_n': results.execution_n,
+            'time': add_data['time'][0],
+            'phases': instrumentation.phases(),
+            'counters': counters,
+            'neighborhoods': {f'{stats["switch"][0]}-{stats["switch"][1]}':
+                              {key: value for key, value in stats.items() if key != 'switch'}
+                              for stats in nb_stats.values()}}
+
+
+def get_algorithm_params(config: dict) -> str:
+    '''
+    Builds the name of an algorithm configuration, used to identify its outputs.
+
+    Args:
+      config (dict): contains the configuration settings for the algorithm.
+
+    Returns:
+      (str): parameter configuration used in the optimization algorithm.
+    '''
+    return (f'IT{config.get("iterations")}'
+            f'_b{config.get("parameters").get("beta")}'
+            f'_{config.get("scheme")[:3]}'
+            # f'_nb{len(config.get("neighborhoods"))}'
+            f'{"_AdNb" if config.get("neighborhood_order") == "Adaptive" else ""}'
+            f'{"_PR" if config.get("path_relinking") else ""}'
+            ).replace('.', '')
+
+
+def execute_iterations(inst: dict, config: dict, start: datetime.datetime, nb_stats: dict,
+                       memo: grasp.LocalSearchMemo, duplicates: dict, completed: set = None):
+    '''
+    Runs the GRASP iterations defined in config sequentially, until the maximum execution time is
+    exceeded.
+
+    Args:
+      inst (dict): contains the instance data.
+      config (dict): contains the configuration settings for the algorithm.
+      start (datetime.datetime): start time of the execution.
+      nb_stats (dict): statistics of each neighborhood explored in the local search.
+      memo (LocalSearchMemo): results of the local searches of previous iterations.
+      duplicates (dict): node set hashes of the LS starts, used to skip repeated local searches
+    when the memo is disabled.
+      completed (set): iterations already finished in a resumed execution, which are skipped.
+
+    Yields:
+      (tuple): the number of the iteration, the solutions from the construction stage and the
+    solutions after the LS stage of each iteration.
+    '''
+    max_time = config.get('execution_limits').get('max_time')
+    completed = completed or set()
+    for i in range(config.get('iterations')):
+        if i in completed:
+            continue
+        # If time is exceeded stop execution
+        if datetime.timedelta(seconds=max_time) < datetime.datetime.now() - start:
+            logging.info('Maximum allowed execution time is exceeded. Total IT: %s', i)
+            break
+
+        # Run B-GRASP-VND
+        logging.debug('Finding solution #%s', i + 1)
+        yield (i, *grasp.execute(inst, config, get_objective(config, i), i, nb_stats, memo,
+                                 duplicates))
+
+
+def execute_iterations_parallel(path: str, inst: dict, config: dict, start: datetime.datetime,
+                                nb_stats: dict, memo: grasp.LocalSearchMemo, duplicates: dict,
+                                workers: int, base_seed: int, completed: set = None):
+    '''
+    Runs the GRASP iterations defined in config in a pool of `workers` processes, until the
+    maximum execution time is exceeded. The instance is read once by each worker, and each
+    iteration uses its own random seed derived from `base_seed`, so with the Fixed neighborhood
+    order the solutions of each iteration are reproducible regardless of the worker that runs it
+    (as long as the local search time limits are not reached, e.g. in the Best scheme). With the
+    Adaptive order each worker reorders the neighborhoods with its own statistics, so the results
+    depend on how the iterations are spread across the workers. The solutions are yielded as soon
+    as each iteration finishes, and the neighborhood statistics, memo counters and skipped local
+    searches of all the workers are added to `nb_stats`, `memo` and `duplicates` at the end.
+
+    Args:
+      path (str): represents the path to the instance that needs to be solved.
+      inst (dict): contains the instance data.
+      config (dict): contains the configuration settings for the algorithm.
+      start (datetime.datetime): start time of the execution.
+      nb_stats (dict): statistics of each neighborhood explored in the local search.
+      memo (LocalSearchMemo): memo whose counters are updated with the ones of the workers.
+      duplicates (dict): contains the counter `ls_skipped`, updated with the local searches
+    skipped by the workers when the memo is disabled.
+      workers (int): number of worker processes.
+      base_seed (int): random seed from which the seed of each iteration is derived.
+      completed (set): iterations already finished in a resumed execution, which are skipped.
+
+    Yields:
+      (tuple): the number of the iteration, the solutions from the construction stage and the
+    solutions after the LS stage of each iteration.
+    '''
+    max_time = config.get('execution_limits').get('max_time')
+    n_iterations = config.get('iterations')
+    remaining = [i for i in range(n_iterations) if i not in (completed or set())]
+    worker_stats = {}
+    if config.get('neighborhood_order') == 'Adaptive':
+        logging.warning('The Adaptive neighborhood order is updated by each worker separately, so '
+                        'the results depend on the number of workers.')
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(path, config)) as executor:
+        pending = set()
+        while len(remaining) > 0 or len(pending) > 0:
+            # If time is exceeded stop submitting new iterations
+            if datetime.timedelta(seconds=max_time) < datetime.datetime.now() - start:
+                if len(remaining) > 0:
+                    logging.info('Maximum allowed execution time is exceeded. Total IT: %s',
+                                 n_iterations - len(remaining))
+                    remaining = []
+            # Keep the workers busy with a small queue of submitted iterations
+            while len(remaining) > 0 and len(pending) < 2 * workers:
+                i = remaining.pop(0)
+                logging.debug('Finding solution #%s', i + 1)
+                pending.add(executor.submit(execute_worker_iteration, i,
+                                            get_objective(config, i), f'{base_seed}_{i}'))
+
+            with instrumentation.timer('worker_wait'):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                (i, c_sol_list, solution_list, pid, stats, ls_counters,
+                 phases) = future.result()
+                worker_stats[pid] = (stats, ls_counters, phases)
+                for sol in c_sol_list + solution_list:
+                    sol.set_instance(inst)
+                yield i, c_sol_list, solution_list
+
+    # Merge the statistics of all the workers. Their phases are summed over the workers, so they
+    # are kept apart from the phases of the main process
+    for stats, (hits, misses, ls_skipped), phases in worker_stats.values():
+        instrumentation.merge(phases, prefix='workers_')
+        for nb, worker_nb_stats in stats.items():
+            if nb not in nb_stats:
+                nb_stats[nb] = {key: 0 for key in worker_nb_stats}
+                nb_stats[nb]['switch'] = worker_nb_stats['switch']
+            for key, value in worker_nb_stats.items():
+                if key != 'switch':
+                    nb_stats[nb][key] += value
+        if memo is not None:
+            memo.hits += hits
+            memo.misses += misses
+        duplicates['ls_skipped'] += ls_skipped
+
+
+def init_worker(path: str, config: dict):
+    '''
+    Initializes a worker process of the parallel execution reading the instance once.
+
+    Args:
+      path (str): represents the path to the instance that needs to be solved.
+      config (dict): contains the configuration settings for the algorithm.
+    '''
+    WORKER_STATE['inst'] = instance.read_instance(path)
+    WORKER_STATE['config'] = config
+    WORKER_STATE['nb_stats'] = {}
+    ls_memo_size = config.get('execution_limits').get('ls_memo_size')
+    WORKER_STATE['memo'] = grasp.LocalSearchMemo(ls_memo_size) if ls_memo_size else None
+    WORKER_STATE['duplicates'] = {'ls_starts': set(), 'ls_skipped': 0}
+    instrumentation.enable(bool(config.get('instrumentation')))
+    instrumentation.reset()
+
+
+def execute_worker_iteration(iteration: int, objective: int, seed: str) -> tuple:
+    '''
+    Runs a GRASP iteration in a worker process.
+
+    Args:
+      iteration (int): number of the iteration.
+      objective (int): ID of the objective considered for this iteration. {0: MaxSum, 1: MaxMin}.
+      seed (str): random seed of the iteration.
+
+    Returns:
+      (tuple): the number of the iteration, the solutions from the construction stage and after
+    the LS stage, the worker process ID, and its accumulated neighborhood statistics, local search
+    (memo hits, memo misses, skipped) counters and instrumentation snapshot.
+    '''
+    random.seed(seed)
+    memo = WORKER_STATE['memo']
+    duplicates = WORKER_STATE['duplicates']
+    c_sol_list, solution_list = grasp.execute(WORKER_STATE['inst'], WORKER_STATE['config'],
+                                              objective, iteration, WORKER_STATE['nb_stats'],
+                                              memo, duplicates)
+    hits, misses = (memo.hits, memo.misses) if memo is not None else (0, 0)
+    ls_counters = (hits, misses, duplicates['ls_skipped'])
+    return (iteration, c_sol_list, solution_list, os.getpid(), WORKER_STATE['nb_stats'],
+            ls_counters, instrumentation.snapshot())
+
+
+def get_objective(config: dict, iteration: int) -> int:
+    '''
+    Defines the objective considered in the construction of an iteration.
+
+    Args:
+      config (dict): contains the configuration settings for the algorithm.
+      iteration (int): number of the iteration.
+
+    Returns:
+      (int): ID of the objective. {0: MaxSum, 1: MaxMin}.
+    '''
+    construction_approach = config.get('mo_approach_C')
+    objective = iteration % 2  # 0: MaxSum, 1: MaxMin (for default AltBwC approach)
+
+    # Check if a single objective approach have been defined
+    if construction_approach == 'MaxSum':
+        objective = 0
+    elif construction_approach == 'MaxMin':
+        objective = 1
+
+    return objective
+
+
+def discard_duplicates(solution_list: list, duplicates: dict) -> list:
+    '''
+    Discards the solutions whose node set has already been found, comparing the Zobrist hash of
+    the node sets, so they are not stored nor checked for dominance again.
+
+    Args:
+      solution_list (list): solutions (Solution instances) found in an iteration.
+      duplicates (dict): contains the set `solutions` with the node set hashes of the solutions
+    found so far, and the counter `sols_skipped` of the discarded duplicated solutions.
+
+    Returns:
+      (list): solutions in `solution_list` with a new node set.
+    '''
+    new_solutions = []
+    for sol in solution_list:
+        if sol.node_hash in duplicates['solutions']:
+            duplicates['sols_skipped'] += 1
+            continue
+        duplicates['solutions'].add(sol.node_hash)
+        new_solutions.append(sol)
+    return new_solutions
+
+
+def execute_directory(directory: str, config: dict, experiment: int = 0,
+                      manifest: checkpoint.CampaignManifest = None):
     '''
     Scans a directory for text files, executes instances with specified configurations, and saves
     the results in a CSV file.
@@ -114,12 +498,28 @@ def execute_directory(directory: str, config: dict):
     Args:
       directory (str): represents the path to the directory where the files (instances) are located.
       config (dict): contains the configuration settings for the algorithm.
+      experiment (int): number of the experiment of the configuration.
+      manifest (CampaignManifest): manifest of the campaign. If it is provided, the instances
+    already solved in this experiment are skipped and the execution number is kept on resume.
     '''
     with os.scandir(directory) as files:
         ficheros = [file.name for file in files if file.is_file() and file.name.endswith(".txt")]
 
-    results = OutputHandler()
+    params = get_algorithm_params(config)
+    if manifest is not None:
+        results = manifest.create_output_handler(params, experiment)
+    else:
+        results = OutputHandler()
 
     for f in ficheros:
         path = os.path.join(directory, f)
-        execute_instance(path, config, results)
+        if manifest is not None:
+            if manifest.is_completed(params, path, experiment):
+                logging.info('Skipping completed instance %s (execution %s).',
+                             path, results.execution_n)
+                continue
+            # Continue with the random sequence of the last completed instance
+            manifest.restore_random_state()
+        execute_instance_profiled(path, config, results)
+        if manifest is not None:
+            manifest.complete(params, path, experiment)
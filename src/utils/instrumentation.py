@@ -0,0 +1,111 @@
+'''Lightweight instrumentation of the execution phases (timers and counters)'''
+import contextlib
+import time
+
+ENABLED = False  # If False, timers and counters do nothing
+TIMES = {}  # Accumulated time (seconds) of each phase
+CALLS = {}  # Number of times each phase has been timed
+COUNTERS = {}  # Accumulated value of each counter
+
+NULL_TIMER = contextlib.nullcontext()
+
+
+class PhaseTimer:
+    '''Context manager that adds the time spent in its block to a phase'''
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        TIMES[self.name] = TIMES.get(self.name, 0) + time.perf_counter() - self.start
+        CALLS[self.name] = CALLS.get(self.name, 0) + 1
+        return False
+
+
+def enable(enabled: bool = True):
+    '''
+    Enables or disables the timers and counters.
+
+    Args:
+      enabled (bool): whether the phases are timed and counted.
+    '''
+    global ENABLED
+    ENABLED = enabled
+
+
+def reset():
+    '''Removes the times and counters recorded so far.'''
+    TIMES.clear()
+    CALLS.clear()
+    COUNTERS.clear()
+
+
+def timer(name: str):
+    '''
+    Times a block of code as a phase, e.g. `with instrumentation.timer('construction'):`. When the
+    instrumentation is disabled a shared empty context manager is returned.
+
+    Args:
+      name (str): name of the phase.
+
+    Returns:
+      (PhaseTimer | contextlib.nullcontext): context manager timing the block.
+    '''
+    if not ENABLED:
+        return NULL_TIMER
+    return PhaseTimer(name)
+
+
+def count(name: str, value: int = 1):
+    '''
+    Adds `value` to a counter if the instrumentation is enabled.
+
+    Args:
+      name (str): name of the counter.
+      value (int): value added to the counter.
+    '''
+    if ENABLED:
+        COUNTERS[name] = COUNTERS.get(name, 0) + value
+
+
+def snapshot() -> dict:
+    '''
+    Copies the times and counters recorded so far, e.g. to send them from a worker process.
+
+    Returns:
+      (dict): `times`, `calls` and `counters` of the phases.
+    '''
+    return {'times': dict(TIMES), 'calls': dict(CALLS), 'counters': dict(COUNTERS)}
+
+
+def merge(data: dict, prefix: str = ''):
+    '''
+    Adds the times and counters of a snapshot (e.g. of a worker process) to the current ones.
+
+    Args:
+      data (dict): snapshot created with `snapshot`.
+      prefix (str): prefix added to the names of the phases of the snapshot, e.g. to keep the
+    time of the worker processes apart from the time of the main process. The counters are added
+    without it.
+    '''
+    for recorded, new in ((TIMES, data['times']), (CALLS, data['calls'])):
+        for name, value in new.items():
+            recorded[prefix + name] = recorded.get(prefix + name, 0) + value
+    for name, value in data['counters'].items():
+        COUNTERS[name] = COUNTERS.get(name, 0) + value
+
+
+def phases() -> dict:
+    '''
+    Summarizes the time and number of calls of each phase.
+
+    Returns:
+      (dict): `time` (seconds) and `calls` of each phase.
+    '''
+    return {name: {'time': round(TIMES[name], 4), 'calls': CALLS[name]} for name in TIMES}
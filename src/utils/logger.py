@@ -1,28 +1,73 @@
 '''Functions to handle logs'''
+import atexit
 import datetime
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 ANSI_RESET = "\033[0m"
 ANSI_GREEN = "\033[92m"
 ANSI_YELLOW = "\033[93m"
 ANSI_RED = "\033[91m"
 ANSI_GRAY = "\033[90m"
+ANSI_BLUE = "\033[94m"
+
+# Level of the loggers, which can be set with the GDP_LOG_LEVEL environment variable
+LOG_LEVEL = os.environ.get('GDP_LOG_LEVEL', 'INFO').upper()
+
+LOGGERS = {}  # Loggers created with load_logger
+HANDLERS = []  # Console and file handlers, shared by all the loggers
+LISTENER = {}  # Listener writing the queued records and ID of the process that started it
 
 
 def load_logger(name):
     '''
-    This function creates and returns a custom logger object.
+    This function creates and returns a custom logger object. The records are put in a queue and
+    written to the console and the log file by a listener thread, so the callers never wait for
+    the I/O. Loading the same logger several times returns it without adding new handlers.
 
     Args:
       param_name: the name of the logger. It is used to identify the logger.
 
     Returns:
-      A logger object that has been configured with a console handler and a specific
-    log level and formatter.
+      A logger object that has been configured with a queue handler and the log level.
     '''
+    if name in LOGGERS:
+        return LOGGERS[name]
+
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    logger.addHandler(get_queue_handler())
+    LOGGERS[name] = logger
+
+    return logger
+
+
+def set_level(level):
+    '''
+    Sets the level of all the loggers, e.g. `logging.WARNING` for a quiet execution.
+
+    Args:
+      level (int | str): log level.
+    '''
+    global LOG_LEVEL
+    LOG_LEVEL = level
+    for logger in LOGGERS.values():
+        logger.setLevel(level)
+
+
+def get_queue_handler():
+    '''
+    Creates the console and file handlers, the queue handler and its listener the first time it
+    is called, and returns the queue handler shared by all the loggers.
+
+    Returns:
+      (QueueHandler): handler that puts the records in the queue of the listener.
+    '''
+    if 'handler' in LISTENER:
+        return LISTENER['handler']
 
     formatter = ColoredFormatter(
         "[%(colored_levelname)s] %(colored_timestamp)s - %(colored_name)s - %(message)s")
@@ -30,8 +75,6 @@ def load_logger(name):
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
 
-    logger.addHandler(console_handler)
-
     log_folder = os.path.join(os.path.dirname(__file__), '..', '..', 'logs')
     os.makedirs(log_folder, exist_ok=True)
 
@@ -43,9 +86,42 @@ def load_logger(name):
     file_handler = logging.FileHandler(log_file, mode='a')
     file_handler.setFormatter(file_formatter)
 
-    logger.addHandler(file_handler)
+    HANDLERS.extend([console_handler, file_handler])
+
+    handler = ProcessQueueHandler(queue.Queue(-1))
+    handler.addFilter(add_timestamp)
+    LISTENER['handler'] = handler
+    LISTENER['listener'] = QueueListener(handler.queue, *HANDLERS)
+    LISTENER['listener'].start()
+    LISTENER['pid'] = os.getpid()
+    atexit.register(stop_listener)
+
+    return handler
 
-    return logger
+
+def stop_listener():
+    '''Writes the records left in the queue and stops the listener.'''
+    if LISTENER.get('pid') == os.getpid():
+        LISTENER['listener'].stop()
+        LISTENER['pid'] = None
+
+
+def add_timestamp(record):
+    '''Sets the time when the record is logged, before it is queued.'''
+    record.timestamp = datetime.datetime.now()
+    return True
+
+
+class ProcessQueueHandler(QueueHandler):
+    '''Queue handler whose records are written by the listener of the process that started it.
+    In other processes (e.g. forked workers) there is no listener thread, so the records are
+    written directly.'''
+    def enqueue(self, record):
+        if LISTENER.get('pid') == os.getpid():
+            super().enqueue(record)
+        else:
+            for handler in HANDLERS:
+                handler.handle(record)
 
 
 class ColoredFormatter(logging.Formatter):
@@ -61,20 +137,19 @@ class ColoredFormatter(logging.Formatter):
           The formatted log record with added color codes for the levelname, logger name, and
         timestamp.
         '''
-        if record.levelno == logging.ERROR:
+        if record.levelno >= logging.ERROR:
             record.colored_levelname = f"{ANSI_RED}{record.levelname}{ANSI_RESET}"
         elif record.levelno == logging.WARNING:
             record.colored_levelname = f"{ANSI_YELLOW}{record.levelname}{ANSI_RESET}"
         elif record.levelno == logging.INFO:
             record.colored_levelname = f"{ANSI_GREEN}{record.levelname}{ANSI_RESET}"
+        else:
+            record.colored_levelname = f"{ANSI_BLUE}{record.levelname}{ANSI_RESET}"
 
         record.colored_name = f"{ANSI_GRAY}{record.name}{ANSI_RESET}"
-        timestamp = datetime.datetime.now()
-        record.colored_timestamp = f"{ANSI_GRAY}{timestamp}{ANSI_RESET}"
-
-        record.levelname = record.levelname
-        record.name = record.name
-        record.timestamp = timestamp
+        if not hasattr(record, 'timestamp'):
+            record.timestamp = datetime.datetime.now()
+        record.colored_timestamp = f"{ANSI_GRAY}{record.timestamp}{ANSI_RESET}"
 
         return super().format(record)
 
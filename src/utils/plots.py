@@ -0,0 +1,127 @@
+'''Background rendering of the Pareto Front plots from the stored results'''
+import multiprocessing
+import os
+import re
+import time
+
+from utils.filelock import atomic_path
+from utils.logger import load_logger
+
+logging = load_logger(__name__)
+
+RESULT_FILE = re.compile(r'^results_(\d+)\.(csv|parquet|feather)$')
+
+
+def pareto_front(table, instance: str):
+    '''
+    Generates a scatter plot using data from a DataFrame and customizes the plot. Plotly is only
+    imported when a plot is generated.
+
+    Args:
+      table (pd.DataFrame): contains solution data.
+      instance (str): represents the name or path of a specific file (instance).
+
+    Returns:
+      (go.Figure): figure with solution's Pareto Front plot.
+    '''
+    import plotly.express as px
+
+    table['Constraint values'] = ('Cost: ' + table.Cost.astype(str) +
+                                  ' & Capacity: ' + table.Capacity.astype(str))
+    fig = px.scatter(table, x='MaxMin', y='MaxSum', color='Constraint values')
+    fig.update_layout(title_text=os.path.split(instance)[-1].split(".")[0])
+
+    return fig
+
+
+def render_pending(output_dirs: list, since: float = 0) -> int:
+    '''
+    Renders the Pareto Front plot (`solution_<n>.html`) of every stored result file
+    (`results_<n>.csv`, `.parquet` or `.feather`) in the `output_dirs` that has been written
+    since the time `since` and has not been plotted yet, so the results of previous campaigns are
+    not plotted.
+
+    Args:
+      output_dirs (list): directories with the results of the campaign.
+      since (float): minimum modification time (seconds since the epoch) of the result files.
+
+    Returns:
+      (int): number of plots rendered.
+    '''
+    import pandas as pd
+
+    rendered = 0
+    for root, _, files in (walk for output_dir in output_dirs for walk in os.walk(output_dir)):
+        for file in files:
+            match = RESULT_FILE.match(file)
+            if match is None:
+                continue
+            execution_n, extension = match.groups()
+            html_file = os.path.join(root, f'solution_{execution_n}.html')
+            filename = os.path.join(root, file)
+            if os.path.exists(html_file) or os.path.getmtime(filename) < since:
+                continue
+
+            if extension == 'csv':
+                table = pd.read_csv(filename)
+            elif extension == 'parquet':
+                table = pd.read_parquet(filename)
+            else:
+                table = pd.read_feather(filename)
+
+            figure = pareto_front(table, root)
+            with atomic_path(html_file) as tmp_path:
+                figure.write_html(tmp_path)
+            rendered += 1
+
+    return rendered
+
+
+def render_loop(output_dirs: list, since: float, stop_event, interval: float):
+    '''
+    Renders the pending plots every `interval` seconds until `stop_event` is set, and a last time
+    after it is set.
+
+    Args:
+      output_dirs (list): directories with the results of the campaign.
+      since (float): start time of the campaign (seconds since the epoch).
+      stop_event (multiprocessing.Event): event set when the solving stage is finished.
+      interval (float): seconds between two rendering passes.
+    '''
+    while not stop_event.wait(interval):
+        render_pending(output_dirs, since)
+    rendered = render_pending(output_dirs, since)
+    logging.info('Pareto Front plots rendered in the last pass: %s.', rendered)
+
+
+class RenderStage:
+    '''Class to render the Pareto Front plots in a background process from the results stored by
+    the solver, so the solver processes never import plotly nor build figures. Only the results
+    written in the campaign directories after the stage is created are plotted'''
+    def __init__(self, output_dirs: list, interval: float = 5):
+        '''Initialize RenderStage
+
+        Args:
+          output_dirs (list): directories with the results of the campaign.
+          interval (float): seconds between two rendering passes.
+        '''
+        self.output_dirs = output_dirs
+        self.since = time.time()
+        self.interval = interval
+        self.stop_event = multiprocessing.Event()
+        self.process = None
+
+    def start(self):
+        '''Starts the background rendering process. It is a daemon process, so it never keeps the
+        program alive if the stage is not stopped.'''
+        self.process = multiprocessing.Process(target=render_loop,
+                                               args=(self.output_dirs, self.since,
+                                                     self.stop_event, self.interval),
+                                               daemon=True)
+        self.process.start()
+
+    def stop(self):
+        '''Renders the remaining plots and waits for the background process to finish.'''
+        self.stop_event.set()
+        if self.process is not None:
+            self.process.join()
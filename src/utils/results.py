@@ -1,49 +1,130 @@
-'''Class to handle result plotting and saving'''
+'''Class to handle result saving'''
+import json
 import os
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from typing import TYPE_CHECKING
+
+from structure.table import COLUMNS, SolutionTable
+from utils import instrumentation
+from utils.filelock import EXECUTION_LOCK, OUTPUT_LOCK, atomic_path, file_lock
+from utils.store import ResultStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+OUTPUT_FORMATS = ['csv', 'parquet', 'feather']
+TRACE_COLUMNS = ['time', 'iterations', 'hypervolume', 'nd_sols']
 
 
 class OutputHandler:
-    '''Class to handle result plotting and saving'''
-    def __init__(self):
-        '''Initialize OutputHandler'''
+    '''Class to handle result saving. The Pareto Front plots are rendered from the saved results
+    in a background stage (utils.plots)'''
+    def __init__(self, execution_n: int = None):
+        '''Initialize OutputHandler
+
+        Args:
+          execution_n (int): execution number of a resumed execution. If it is not provided, a
+        new execution number is assigned.
+        '''
         self.execution_n = -1
-        # TODO add boolean input for PLOT
-        self._get_execution_number()
+        if execution_n is None:
+            self._get_execution_number()
+        else:
+            self.execution_n = execution_n
 
-    def pareto_front(self, table: pd.DataFrame, instance: str) -> go.Figure:
+    def save(self, table: list, all_sols: SolutionTable, c_sols: SolutionTable,
+             add_data: dict, params: str, instance: str,
+             output_format: str = 'csv', store: bool = False, trace: list = None):
         '''
-        Generates a scatter plot using data from a DataFrame and customizes the plot.
+        This function saves the solution table as a CSV in a specified directory structure that
+        contains the instance name and execution number as ID. pandas is only imported here, by
+        the output layer, so the solver can be imported and run without it. The writing of the
+        solution and trace files is timed as the `output_writing` phase, which is added to
+        `add_data` before it is saved.
 
         Args:
-          table (pd.DataFrame): contains solution data.
+          table (list): contains solution data, one [Solution, MaxSum, MaxMin, Cost, Capacity] row
+        per solution.
+          all_sols (SolutionTable): contains the data of all the solutions after the LS stage,
+        saved as `resultsAll_<n>.csv` if it is provided.
+          c_sols (SolutionTable): contains the data of the solutions of the construction stage,
+        saved as `resultsConst_<n>.csv` if it is provided.
+          add_data (dict): contains additional data of the execution.
+          params (str): parameter configuration used in the optimization algorithm.
           instance (str): represents the name or path of a specific file (instance).
-
-        Returns:
-          (go.Figure): figure with solution's Pareto Front plot.
+          output_format (str): format of the solution file. {csv, parquet, feather}.
+          store (bool): if True, the run is also appended to the consolidated results store.
+          trace (list): anytime trace of the execution, one [time, iterations, hypervolume,
+        nd_sols] record each time the archive changed. It is saved as `trace_<n>.csv`.
         '''
-        table['Constraint values'] = ('Cost: ' + table.Cost.astype(str) +
-                                      ' & Capacity: ' + table.Capacity.astype(str))
-        fig = px.scatter(table, x='MaxMin', y='MaxSum', color='Constraint values')
-        fig.update_layout(title_text=os.path.split(instance)[-1].split(".")[0])
-        # fig.show()
+        import pandas as pd
+
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'.")
+
+        with instrumentation.timer('output_writing'):
+            table = pd.DataFrame(table, columns=COLUMNS)
+
+            output_path = self.get_output_path(params, instance)
+
+            for name, sols in (('resultsConst', c_sols), ('resultsAll', all_sols)):
+                if sols is not None:
+                    with atomic_path(os.path.join(output_path,
+                                                  f'{name}_{self.execution_n}.csv')) as tmp_path:
+                        sols.to_dataframe().to_csv(tmp_path, index=False)
+
+            if output_format == 'csv':
+                with atomic_path(os.path.join(output_path,
+                                              f'results_{self.execution_n}.csv')) as tmp_path:
+                    table.to_csv(tmp_path, index=False)
+            else:
+                self._save_columnar(table, add_data, params, instance,
+                                    os.path.join(output_path,
+                                                 f'results_{self.execution_n}.{output_format}'))
+
+            if trace is not None:
+                with atomic_path(os.path.join(output_path,
+                                              f'trace_{self.execution_n}.csv')) as tmp_path:
+                    pd.DataFrame(trace, columns=TRACE_COLUMNS).to_csv(tmp_path, index=False)
+
+        if instrumentation.ENABLED:
+            add_data['output_writing_time'] = [instrumentation.phases()['output_writing']['time']]
+        self._save_execution_add_data(add_data, output_path)
 
-        return fig
+        if store:
+            result_store = ResultStore()
+            result_store.add_run(f'B-GRASP_{params}', instance, self.execution_n, table, add_data,
+                                 trace)
+            result_store.close()
 
-    def save(self, table: pd.DataFrame, all_sols, c_sols, add_data: dict,
-             figure: go.Figure, params: str, instance: str):
+    def save_profile(self, profile: dict, params: str, instance: str):
         '''
-        This function saves the solution DataFrame as a CSV and the Figure as an HTML file in a
-        specified directory structure that contains the instance name and execution number as ID.
+        Saves the profile of an execution (time per phase and counters) as a JSON file next to the
+        solution file.
 
         Args:
-          table (pd.DataFrame): contains solution data.
-          figure (go.Figure): figure with solution's Pareto Front plot.
+          profile (dict): profile of the execution.
           params (str): parameter configuration used in the optimization algorithm.
           instance (str): represents the name or path of a specific file (instance).
         '''
+        output_path = self.get_output_path(params, instance)
+        with atomic_path(os.path.join(output_path,
+                                      f'profile_{self.execution_n}.json')) as tmp_path:
+            with open(tmp_path, 'w') as file:
+                json.dump(profile, file, indent=2, default=float)
+
+    @staticmethod
+    def get_output_path(params: str, instance: str) -> str:
+        '''
+        Builds (and creates) the output directory of an instance (or of a directory of instances)
+        for a parameter configuration.
+
+        Args:
+          params (str): parameter configuration used in the optimization algorithm.
+          instance (str): represents the name or path of a specific file (instance) or directory.
+
+        Returns:
+          (str): path of the output directory.
+        '''
         instance_path = instance.split(os.sep)[1:]
         instance_path = [s.replace('.txt', '') for s in instance_path]
         output_path = os.path.join('output',
@@ -52,53 +133,77 @@ class OutputHandler:
 
         os.makedirs(output_path, exist_ok=True)
 
-        # c_sols.to_csv(os.path.join(output_path,
-        #                           f'resultsConst_{self.execution_n}.csv'),
-        #              index=False)
-
-        # all_sols.to_csv(os.path.join(output_path,
-        #                           f'resultsAll_{self.execution_n}.csv'),
-        #              index=False)
-
-        table.to_csv(os.path.join(output_path,
-                                  f'results_{self.execution_n}.csv'),
-                     index=False)
-
-        self._save_execution_add_data(add_data, output_path)
+        return output_path
 
-        # figure.write_html(os.path.join(output_path,
-        #                                f'solution_{self.execution_n}.html'))
+    def _save_columnar(self, table: 'pd.DataFrame', add_data: dict, params: str, instance: str,
+                       path: str):
+        '''
+        Saves the solution DataFrame in a Parquet or Feather file (by the extension of `path`),
+        with the node set of each solution as a list of integers and the run metadata (execution
+        number, parameters, instance and additional data) in the schema metadata. Requires
+        pyarrow, which is only imported when this output format is used.
+        '''
+        import pyarrow as pa
+
+        nodes = [[int(u) for u in s.split(' - ')] if isinstance(s, str) and s else []
+                 for s in table.Solution]
+        arrow_table = pa.table({
+            'Solution': pa.array(nodes, type=pa.list_(pa.int32())),
+            'MaxSum': pa.array(table.MaxSum, type=pa.float64()),
+            'MaxMin': pa.array(table.MaxMin, type=pa.float64()),
+            'Cost': pa.array(table.Cost, type=pa.int64()),
+            'Capacity': pa.array(table.Capacity, type=pa.int64())
+        }).select(COLUMNS)
+        arrow_table = arrow_table.replace_schema_metadata({
+            'execution_n': str(self.execution_n),
+            'params': params,
+            'instance': instance,
+            'add_data': json.dumps(add_data, default=float)
+        })
+
+        with atomic_path(path) as tmp_path:
+            if path.endswith('.parquet'):
+                import pyarrow.parquet as pq
+                pq.write_table(arrow_table, tmp_path)
+            else:
+                import pyarrow.feather as feather
+                feather.write_feather(arrow_table, tmp_path)
 
     def _get_execution_number(self):
         '''
         The function reads an execution number from a file, increments it by 1, and writes the
-        updated number back to the file.
+        updated number back to the file. The counter is shared by every campaign writing to the
+        same output tree and it is never reset, so an execution number is never reused.
         '''
         execution_file = os.path.join('temp', 'execution.txt')
 
-        if os.path.exists(execution_file):
-            with open(execution_file, 'r+') as file:
-                self.execution_n = file.read()
-                file.seek(0)
-                file.write(str(int(self.execution_n) + 1))
-                file.truncate()
-        else:
-            self.execution_n = 1
-            os.makedirs('temp', exist_ok=True)
-            with open(execution_file, 'w') as file:
-                file.write(str(int(self.execution_n) + 1))
+        # The file is locked so concurrent runs never get the same execution number
+        with file_lock(EXECUTION_LOCK):
+            if os.path.exists(execution_file):
+                with open(execution_file, 'r') as file:
+                    self.execution_n = int(file.read())
+            else:
+                self.execution_n = 1
+            with atomic_path(execution_file) as tmp_path:
+                with open(tmp_path, 'w') as file:
+                    file.write(str(self.execution_n + 1))
 
     def _save_execution_add_data(self, add_data: dict, path: str):
         '''
-        The function saves algorithm's execution time `secs` in seconds in a csv file.
+        The function saves algorithm's execution time `secs` in seconds in a csv file. The file is
+        shared by all the executions, so it is read, updated and replaced holding a lock.
         '''
+        import pandas as pd
+
         time_file = os.path.join(path, 'add_data.csv')
         new_row = {'ex_number': [self.execution_n]}
         new_row.update(add_data)
-        if os.path.exists(time_file):
-            time_table = pd.read_csv(time_file)
-            time_table = time_table.append(pd.DataFrame(new_row))
-        else:
-            time_table = pd.DataFrame(new_row)
-
-        time_table.to_csv(time_file, index=False)
+        with file_lock(OUTPUT_LOCK):
+            if os.path.exists(time_file):
+                time_table = pd.read_csv(time_file)
+                time_table = time_table.append(pd.DataFrame(new_row))
+            else:
+                time_table = pd.DataFrame(new_row)
+
+            with atomic_path(time_file) as tmp_path:
+                time_table.to_csv(tmp_path, index=False)
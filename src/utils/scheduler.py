@@ -0,0 +1,109 @@
+'''Parallel scheduler of the (config, instance, experiment) executions of a campaign'''
+import copy
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils import execution
+from utils.checkpoint import CampaignManifest
+from utils.results import OutputHandler
+from utils.logger import load_logger
+
+logging = load_logger(__name__)
+
+
+def create_tasks(directory: str, config_list: list, seed: int = 42,
+                 manifest: CampaignManifest = None) -> list:
+    '''
+    Expands the grid of configurations, instances in `directory` and experiments into a list of
+    tasks sorted from the largest to the smallest instance, so the longest tasks are started
+    first and the total execution time (makespan) is minimized. The execution numbers are
+    assigned in the same order as in the sequential execution.
+
+    Args:
+      directory (str): represents the path to the directory where the files (instances) are located.
+      config_list (list): contains the configuration settings of each algorithm configuration.
+      seed (int): base random seed. Each task uses its own seed derived from it.
+      manifest (CampaignManifest): manifest of the campaign. If it is provided, the completed
+    tasks are skipped and the execution numbers of the previous campaign are kept.
+
+    Returns:
+      (list): tasks, each one represented as a dict with the `config`, the instance `path`, the
+    `results` OutputHandler with the execution number, the instance `size`, the random `seed`,
+    the `experiment` number and the configuration `params` name.
+    '''
+    with os.scandir(directory) as files:
+        ficheros = [file.name for file in files if file.is_file() and file.name.endswith(".txt")]
+
+    tasks = []
+    for c, config in enumerate(config_list):
+        # Instances are solved sequentially inside each task
+        task_config = copy.deepcopy(config)
+        task_config['workers'] = 1
+        params = execution.get_algorithm_params(config)
+        for n in range(config.get('experiments')):
+            if manifest is not None:
+                results = manifest.create_output_handler(params, n)
+            else:
+                results = OutputHandler()
+            for f in ficheros:
+                path = os.path.join(directory, f)
+                if manifest is not None and manifest.is_completed(params, path, n):
+                    continue
+                tasks.append({'config': task_config,
+                              'path': path,
+                              'results': results,
+                              'size': get_instance_size(path),
+                              'seed': f'{seed}_{c}_{n}_{f}',
+                              'experiment': n,
+                              'params': params})
+
+    tasks.sort(key=lambda task: -task['size'])
+
+    return tasks
+
+
+def execute_tasks(tasks: list, workers: int, manifest: CampaignManifest = None):
+    '''
+    Executes the tasks in a pool of `workers` processes in the given order.
+
+    Args:
+      tasks (list): tasks created with `create_tasks`.
+      workers (int): number of worker processes.
+      manifest (CampaignManifest): manifest of the campaign where the completed tasks are
+    recorded.
+    '''
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(execute_task, task): task for task in tasks}
+        for count, future in enumerate(as_completed(futures)):
+            task = futures[future]
+            future.result()
+            if manifest is not None:
+                manifest.complete(task['params'], task['path'], task['experiment'])
+            logging.info('Finished task %s/%s: %s (execution %s).',
+                         count + 1, len(tasks), task['path'], task['results'].execution_n)
+
+
+def execute_task(task: dict):
+    '''
+    Solves the instance of a task with its configuration and random seed.
+
+    Args:
+      task (dict): task created with `create_tasks`.
+    '''
+    random.seed(task['seed'])
+    execution.execute_instance_profiled(task['path'], task['config'], task['results'])
+
+
+def get_instance_size(path: str) -> int:
+    '''
+    Reads the number of nodes of an instance from the first line of its file.
+
+    Args:
+      path (str): file path to the instance.
+
+    Returns:
+      (int): number of nodes of the instance.
+    '''
+    with open(path, 'r') as f:
+        return int(f.readline())
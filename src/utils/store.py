@@ -0,0 +1,129 @@
+'''Class to handle the consolidated store of results'''
+import json
+import math
+import os
+import sqlite3
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+STORE_FILE = os.path.join('output', 'results.db')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    algorithm TEXT NOT NULL,
+    instance_set TEXT NOT NULL,
+    subset TEXT NOT NULL,
+    instance TEXT NOT NULL,
+    execution_n INTEGER NOT NULL,
+    add_data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS solutions (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    nodes TEXT,
+    maxsum REAL,
+    maxmin REAL,
+    cost INTEGER,
+    capacity INTEGER
+);
+CREATE TABLE IF NOT EXISTS traces (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    time REAL,
+    iterations INTEGER,
+    hypervolume REAL,
+    nd_sols INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_algorithm ON runs(algorithm, instance_set, subset, instance);
+CREATE INDEX IF NOT EXISTS runs_instance ON runs(instance_set, subset, instance);
+CREATE INDEX IF NOT EXISTS solutions_run ON solutions(run_id);
+CREATE INDEX IF NOT EXISTS traces_run ON traces(run_id);
+'''
+
+
+class ResultStore:
+    '''Append-only SQLite store with the solutions and additional data of every execution (run) of
+    every algorithm and instance, so the results are evaluated with queries instead of walking a
+    tree of small CSV files'''
+    def __init__(self, path: str = STORE_FILE):
+        '''Initialize ResultStore
+
+        Args:
+          path (str): path of the SQLite database file.
+        '''
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Concurrent runs wait for the write lock of the database
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        '''Closes the connection to the database.'''
+        self.connection.close()
+
+    def add_run(self, algorithm: str, instance: str, execution_n: int, table: 'pd.DataFrame',
+                add_data: dict, trace: list = None) -> int:
+        '''
+        Appends the solutions and additional data of a run to the store in a single transaction.
+
+        Args:
+          algorithm (str): name of the algorithm and its parameter configuration.
+          instance (str): represents the name or path of a specific file (instance).
+          execution_n (int): execution number.
+          table (pd.DataFrame): contains solution data.
+          add_data (dict): contains additional data of the execution (e.g. execution time).
+          trace (list): anytime trace of the execution, one [time, iterations, hypervolume,
+        nd_sols] record each time the archive changed.
+
+        Returns:
+          (int): ID of the run in the store.
+        '''
+        instance_set, subset, instance_name = split_instance_path(instance)
+        add_data = {key: value[0] if isinstance(value, list) else value
+                    for key, value in add_data.items()}
+        rows = [(None if s is None or (isinstance(s, float) and math.isnan(s)) else str(s),
+                 float(maxsum), float(maxmin),
+                 int(float(cost)), int(float(capacity)))
+                for s, maxsum, maxmin, cost, capacity
+                in zip(table.Solution, table.MaxSum, table.MaxMin, table.Cost, table.Capacity)]
+
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (algorithm, instance_set, subset, instance, execution_n, '
+                'add_data) VALUES (?, ?, ?, ?, ?, ?)',
+                (algorithm, instance_set, subset, instance_name, int(execution_n),
+                 json.dumps(add_data, default=float)))
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO solutions (run_id, nodes, maxsum, maxmin, cost, capacity) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(run_id, *row) for row in rows])
+            if trace:
+                self.connection.executemany(
+                    'INSERT INTO traces (run_id, time, iterations, hypervolume, nd_sols) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(run_id, *record) for record in trace])
+
+        return run_id
+
+
+def split_instance_path(instance: str) -> tuple:
+    '''
+    Splits the path of an instance into its set, subset and name, following the output structure
+    `<set>/<subset>/<instance>`.
+
+    Args:
+      instance (str): represents the name or path of a specific file (instance).
+
+    Returns:
+      (tuple): set, subset and name of the instance.
+    '''
+    instance_path = instance.split(os.sep)[1:]
+    instance_path = [s.replace('.txt', '') for s in instance_path]
+    *groups, instance_name = instance_path
+    instance_set = groups[0] if len(groups) > 0 else ''
+    subset = os.sep.join(groups[1:])
+
+    return instance_set, subset, instance_name
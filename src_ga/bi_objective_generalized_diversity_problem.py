@@ -2,11 +2,17 @@ import numpy as np
 
 from pymoo.core.problem import Problem
 
+MEMORY_BUDGET = 256 * 2 ** 20  # Default bytes of the arrays of each chunk of the population
+SPARSE_FRACTION = 0.25  # Maximum fraction of selected elements evaluated with the sparse kernel
+PAIR_BYTES = 24  # Bytes per pair of the sparse kernel: row and column indices and distance
+ENTRY_BYTES = 9  # Bytes per entry of the dense kernel: distance submatrix and triangle mask
+
 
 # Custom problem class: Bi-objective diversity model with cost and capacity constraints
 class BiObjectiveGeneralizedDiversityProblem(Problem):
 
-    def __init__(self, dist_matrix, costs, capacities, B, K):
+    def __init__(self, dist_matrix, costs, capacities, B, K, memory_budget=MEMORY_BUDGET,
+                 sparse_fraction=SPARSE_FRACTION, evaluator=None):
         n = dist_matrix.shape[0]  # Number of nodes
 
         # Define the number of variables (n nodes) and number of objectives (2)
@@ -24,44 +30,99 @@ class BiObjectiveGeneralizedDiversityProblem(Problem):
         self.B = B  # Minimum capacity
         self.K = K  # Maximum budget
 
+        # The population is evaluated in chunks whose arrays fit in the memory budget (bytes).
+        # Individuals with up to `sparse_max` selected elements gather the distances of their
+        # pairs by index, and the larger ones from their dense submatrix of distances
+        self.memory_budget = memory_budget or MEMORY_BUDGET
+        self.sparse_max = max(2, int(sparse_fraction * n))
+        self.upper_triangles = {}  # Indices of the pairs of k selected elements
+        self.cached_bytes = 0
+
+        # Optional evaluator of the whole population, such as utils.evaluator.ParallelEvaluator
+        self.evaluator = evaluator
+
     def _evaluate(self, X, out, *args, **kwargs):
-        # Objectives: Max-Sum and Max-Min
-        f1 = []
-        f2 = []
-
-        # Constraints
-        g1 = []  # Total cost must be <= K
-        g2 = []  # Total capacity must be >= B
-
-        for x in X:
-            # Get indices of selected elements (where x[i] == 1)
-            selected = np.where(x == 1)[0]
-
-            if len(selected) > 1:
-                # Max-Sum: Sum of pairwise distances between selected elements
-                sum_dist = np.sum([self.dist_matrix[i, j]
-                                   for i in selected for j in selected if i < j])
-                f1.append(-sum_dist)  # Multiply by -1 to maximize
-
-                # Max-Min: Minimum distance between selected elements
-                min_dist = np.min([self.dist_matrix[i, j]
-                                   for i in selected for j in selected if i != j])
-                f2.append(-min_dist)  # Multiply by -1 to maximize
-            else:
-                # If fewer than 2 elements are selected, the solution is invalid
-                f1.append(float("inf"))
-                f2.append(float("inf"))
+        # The population is evaluated with array operations: the constraints with dot products
+        # and the objectives from the distances between the selected elements of each individual,
+        # gathered at once instead of building lists of pairs
+        X = np.asarray(X, dtype=bool)
+        if self.evaluator is not None:
+            out.update(self.evaluator.evaluate(X))
+            return
+
+        f1, f2, g1, g2 = [], [], [], []
+        for chunk in self._chunks(X):
+            # Objectives: Max-Sum and Max-Min (multiplied by -1 to maximize)
+            # If fewer than 2 elements are selected, the solution is invalid
+            selected = [np.flatnonzero(x) for x in chunk]
+            objectives = np.full((len(chunk), 2), float("inf"))
+            sparse = [i for i, s in enumerate(selected) if 1 < len(s) <= self.sparse_max]
+            self._sparse_kernel(selected, sparse, objectives)
+            for i, s in enumerate(selected):
+                if len(s) > self.sparse_max:
+                    objectives[i] = self._dense_kernel(s)
+            f1.append(objectives[:, 0])
+            f2.append(objectives[:, 1])
 
             # Constraint 1: Total cost must be <= K
-            total_cost = np.sum(self.costs[selected])
-            g1.append(total_cost - self.K)
+            g1.append(chunk.astype(self.costs.dtype) @ self.costs - self.K)
 
             # Constraint 2: Total capacity must be >= B
-            total_capacity = np.sum(self.capacities[selected])
-            g2.append(self.B - total_capacity)
+            g2.append(self.B - chunk.astype(self.capacities.dtype) @ self.capacities)
 
         # Set the objective values
-        out["F"] = np.column_stack([f1, f2])
+        out["F"] = np.column_stack([np.concatenate(f1), np.concatenate(f2)])
 
         # Set the constraint violations (must be <= 0 to satisfy constraints)
-        out["G"] = np.column_stack([g1, g2])
+        out["G"] = np.column_stack([np.concatenate(g1), np.concatenate(g2)])
+
+    def _chunks(self, X):
+        # Consecutive slices of the population whose estimated memory fits in the budget. An
+        # individual larger than the budget is evaluated alone
+        k = X.sum(axis=1)
+        pairs = k * (k - 1) // 2
+        sizes = np.where(k <= self.sparse_max, PAIR_BYTES * pairs, ENTRY_BYTES * k * k)
+        sizes += X.shape[1] * 8  # Rows of the population converted for the constraints
+
+        start, used = 0, 0
+        for i, size in enumerate(sizes):
+            if i > start and used + size > self.memory_budget:
+                yield X[start:i]
+                start, used = i, 0
+            used += size
+        if start < len(X):
+            yield X[start:]
+
+    def _sparse_kernel(self, selected, individuals, objectives):
+        # Distances of the pairs (i < j) of the individuals with few selected elements, gathered
+        # from the distance matrix with a single index operation. The pairs of each individual
+        # are contiguous and in the order they were always summed, so the sums are identical
+        if not individuals:
+            return
+        rows, cols, bounds = [], [], [0]
+        for idx in individuals:
+            upper_i, upper_j = self._upper_triangle(len(selected[idx]))
+            rows.append(selected[idx][upper_i])
+            cols.append(selected[idx][upper_j])
+            bounds.append(bounds[-1] + len(upper_i))
+        distances = self.dist_matrix[np.concatenate(rows), np.concatenate(cols)]
+        for idx, start, end in zip(individuals, bounds, bounds[1:]):
+            objectives[idx] = -np.sum(distances[start:end]), -np.min(distances[start:end])
+
+    def _dense_kernel(self, selected):
+        # Distances of the pairs (i < j) of an individual with many selected elements, taken from
+        # its submatrix of distances with a boolean mask instead of the (larger) pair indices
+        k = len(selected)
+        distances = self.dist_matrix[np.ix_(selected, selected)][np.triu(np.ones((k, k), bool), 1)]
+        return -np.sum(distances), -np.min(distances)
+
+    def _upper_triangle(self, k):
+        # Indices (i, j) with i < j of a k x k matrix, cached for each number of selected
+        # elements. The cache is emptied when it exceeds a quarter of the memory budget
+        if k not in self.upper_triangles:
+            if self.cached_bytes > self.memory_budget // 4:
+                self.upper_triangles.clear()
+                self.cached_bytes = 0
+            self.upper_triangles[k] = np.triu_indices(k, 1)
+            self.cached_bytes += 16 * k * (k - 1) // 2
+        return self.upper_triangles[k]
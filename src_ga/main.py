@@ -1,18 +1,50 @@
 '''Main function'''
+import argparse
 import os
 
-from utils import execution
-from utils.logger import load_logger
+from utils import execution, profiler, scheduler
+from utils.logger import load_logger, set_level
 
 logging = load_logger(__name__)
 
 
 if __name__ == '__main__':
-    logging.info('Initializing diversity maximization with NSGA-II algorithm...')
+    parser = argparse.ArgumentParser(description='NSGA-II and SPEA2 for the BOGDP')
+    parser.add_argument('--path', default=os.path.join('instances', 'GDP', 'GKD-b_n50'),
+                        help='directory with the instances to be solved')
+    parser.add_argument('--experiments', type=int, default=1,
+                        help='number of experiments/executions per instance')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of processes running (instance, experiment) tasks')
+    parser.add_argument('--store', action='store_true',
+                        help='also append the results to the SQLite store output/results.db')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=profiler.PROFILERS,
+                        help='profile the execution of each instance with cProfile (default) or '
+                             'a sampling profiler')
+    parser.add_argument('--profile-top', type=int, default=20,
+                        help='number of functions in the summary of each profile')
+    parser.add_argument('--memory-budget', type=float,
+                        help='MB of the arrays of each chunk of the population evaluated at once '
+                             '(256 by default)')
+    parser.add_argument('--eval-workers', type=int, default=1,
+                        help='number of processes evaluating each generation of the population '
+                             '(per instance, on top of --workers)')
+    parser.add_argument('--quiet', action='store_true',
+                        help='only log warnings and errors')
+    args = parser.parse_args()
+    if args.quiet:
+        set_level('WARNING')
 
-    path = os.path.join('instances', 'GDP', 'GKD-b_n50')
+    logging.info('Initializing diversity maximization with NSGA-II algorithm...')
 
-    for n in range(1):
-        execution.execute_directory(path)
+    path = args.path
+    memory_budget = int(args.memory_budget * 2 ** 20) if args.memory_budget else None
 
-    os.remove(os.path.join('temp', 'execution.txt'))
+    if args.workers > 1:
+        tasks = scheduler.create_tasks(path, args.experiments, args.store, args.profile,
+                                       args.profile_top, memory_budget, args.eval_workers)
+        scheduler.execute_tasks(tasks, args.workers)
+    else:
+        for n in range(args.experiments):
+            execution.execute_directory(path, args.store, args.profile, args.profile_top,
+                                        memory_budget, args.eval_workers)
@@ -0,0 +1,105 @@
+'''Parallel evaluation of the GA population in a pool of processes'''
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from bi_objective_generalized_diversity_problem import BiObjectiveGeneralizedDiversityProblem
+from utils.logger import load_logger
+
+logging = load_logger(__name__)
+
+# Problem of each worker process, whose distance matrix is a view of the shared memory block
+_worker = {}
+
+
+class ParallelEvaluator:
+    '''Evaluator of the population of a BiObjectiveGeneralizedDiversityProblem in a pool of
+    processes. The distance matrix is copied once into a shared memory block that every worker
+    reads without copying it, and each generation is split into one slice of individuals per
+    worker. Any object with an `evaluate(X)` method returning the `F` and `G` arrays can be given
+    to the problem as evaluator'''
+    def __init__(self, workers: int, dist_matrix: np.ndarray, costs: np.ndarray,
+                 capacities: np.ndarray, B: int, K: int, memory_budget: int = None):
+        '''Initialize ParallelEvaluator
+
+        Args:
+          workers (int): number of worker processes.
+          dist_matrix (np.ndarray): distance matrix of the instance.
+          costs (np.ndarray): cost of each node.
+          capacities (np.ndarray): capacity of each node.
+          B (int): minimum capacity.
+          K (int): maximum budget.
+          memory_budget (int): bytes of each chunk of the population evaluated at once by a
+        worker (default of the problem if None).
+        '''
+        self.workers = workers
+        dist_matrix = np.ascontiguousarray(dist_matrix)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, dist_matrix.nbytes))
+        np.ndarray(dist_matrix.shape, dist_matrix.dtype, buffer=self.shm.buf)[:] = dist_matrix
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker,
+            initargs=(self.shm.name, dist_matrix.shape, dist_matrix.dtype, costs, capacities, B,
+                      K, memory_budget))
+        # The pool and the shared memory are released even if the evaluator is not closed
+        self._finalizer = weakref.finalize(self, release, self.executor, self.shm)
+        logging.info('Evaluating the population in %s processes.', workers)
+
+    def evaluate(self, X: np.ndarray) -> dict:
+        '''
+        Evaluates a population, one slice of consecutive individuals per worker.
+
+        Args:
+          X (np.ndarray): population, one boolean row per individual.
+
+        Returns:
+          (dict): objective values `F` and constraint violations `G` of the population, in the
+        order of its individuals.
+        '''
+        slices = np.array_split(X, min(self.workers, len(X)))
+        outputs = list(self.executor.map(evaluate_slice, slices))
+
+        return {key: np.concatenate([out[key] for out in outputs]) for key in ('F', 'G')}
+
+    def close(self):
+        '''Stops the worker processes and frees the shared memory.'''
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __deepcopy__(self, memo):
+        # The pool is shared by the copies of the problem (e.g. in the history of pymoo)
+        return self
+
+    def __getstate__(self):
+        raise TypeError('A ParallelEvaluator cannot be sent to other processes.')
+
+
+def init_worker(name: str, shape: tuple, dtype: np.dtype, costs: np.ndarray,
+                capacities: np.ndarray, B: int, K: int, memory_budget: int):
+    '''Builds the problem of a worker process on the shared distance matrix.'''
+    shm = shared_memory.SharedMemory(name=name)
+    dist_matrix = np.ndarray(shape, dtype, buffer=shm.buf)
+    _worker['shm'] = shm  # Keeps the block mapped while the worker lives
+    _worker['problem'] = BiObjectiveGeneralizedDiversityProblem(dist_matrix, costs, capacities,
+                                                                B, K, memory_budget)
+
+
+def evaluate_slice(X: np.ndarray) -> dict:
+    '''Evaluates a slice of the population with the problem of the worker process.'''
+    out = {}
+    _worker['problem']._evaluate(X, out)
+    return out
+
+
+def release(executor: ProcessPoolExecutor, shm: shared_memory.SharedMemory):
+    '''Shuts down the pool of processes, and closes and frees the shared memory block.'''
+    executor.shutdown()
+    shm.close()
+    shm.unlink()
@@ -1,5 +1,6 @@
 '''Directory and instance execution auxiliar functions'''
 import datetime
+import functools
 import os
 import numpy as np
 import pandas as pd
@@ -17,13 +18,17 @@ from pymoo.termination import get_termination
 
 from structure import instance
 from bi_objective_generalized_diversity_problem import BiObjectiveGeneralizedDiversityProblem
+from utils import profiler
+from utils.evaluator import ParallelEvaluator
 from utils.results import OutputHandler
 from utils.logger import load_logger
 
 logging = load_logger(__name__)
 
 
-def execute_instance(path: str, results: OutputHandler) -> float:
+def execute_instance(path: str, results: OutputHandler, store: bool = False,
+                     memory_budget: int = None, eval_workers: int = 1, profile: str = None,
+                     profile_top: int = 20) -> float:
     '''
     Reads an instance, iterates to find solutions using GRASP algorithm, evaluates the solutions,
     identifies non-dominated solutions, computes execution time, and saves results.
@@ -35,6 +40,14 @@ def execute_instance(path: str, results: OutputHandler) -> float:
       results (OutputHandler): contains methods for handling and displaying the output of the
     algorithm, such as generating plots and saving results to files with the ID number of the
     execution number of each instance.
+      store (bool): if True, the runs are also appended to the consolidated results store.
+      memory_budget (int): bytes of each chunk of the population evaluated at once (default of
+    the problem if None).
+      eval_workers (int): number of processes evaluating each generation of the population.
+      profile (str): profiler of the optimization of each algorithm, if any. {cprofile,
+    sampling}. The profile `profile_<n>.prof` or `profile_<n>.collapsed` is saved next to the
+    results of the algorithm.
+      profile_top (int): number of functions in the summary of each profile.
 
     Returns:
       (float): returns the total execution time in seconds.
@@ -53,8 +66,13 @@ def execute_instance(path: str, results: OutputHandler) -> float:
 
     start = datetime.datetime.now()
 
-    # Create the problem instance
-    problem = BiObjectiveGeneralizedDiversityProblem(dist_matrix, costs, capacities, B, K)
+    # Create the problem instance, evaluated in a pool of processes if requested
+    evaluator = None
+    if eval_workers > 1:
+        evaluator = ParallelEvaluator(eval_workers, dist_matrix, costs, capacities, B, K,
+                                      memory_budget)
+    problem = BiObjectiveGeneralizedDiversityProblem(dist_matrix, costs, capacities, B, K,
+                                                     memory_budget, evaluator=evaluator)
     algorithm_set = ["NSGA2", "SPEA2"]
     # algorithm_set = ['SPEA2']
     for algo in algorithm_set:
@@ -84,13 +102,15 @@ def execute_instance(path: str, results: OutputHandler) -> float:
         # Set termination criteria
         termination = get_termination("n_gen", 200)
 
-        # Run the optimization
-        res = minimize(problem,
-                       algorithm,
-                       termination,
-                       seed=1,
-                       save_history=True,
-                       verbose=True)
+        # Run the optimization, under a profiler if requested
+        optimize = functools.partial(minimize, seed=1, save_history=True, verbose=True)
+        if profile:
+            instance_path = [s.replace('.txt', '') for s in path.split(os.sep)[1:]]
+            res = profiler.profile_call(optimize, (problem, algorithm, termination),
+                                        os.path.join('output', algo, *instance_path),
+                                        f'profile_{results.execution_n}', profile, profile_top)
+        else:
+            res = optimize(problem, algorithm, termination)
 
         elapsed = datetime.datetime.now() - start
         secs = round(elapsed.total_seconds(), 2)
@@ -116,22 +136,30 @@ def execute_instance(path: str, results: OutputHandler) -> float:
         result_table = pd.DataFrame(np.array(result_table).T,
                                     columns=['Solution', 'MaxSum', 'MaxMin', 'Cost', 'Capacity'])
 
-        results.save(result_table, secs, [], '', path, algo)
+        results.save(result_table, secs, [], '', path, algo, store)
 
     else:
         logging.warning('No solution found for %s', path)
 
-        results.save(result_table, secs, [], '', path, algo)
+        results.save(result_table, secs, [], '', path, algo, store)
+
+    if evaluator is not None:
+        evaluator.close()
 
 
-def execute_directory(directory: str):
+def execute_directory(directory: str, store: bool = False, profile: str = None,
+                      profile_top: int = 20, memory_budget: int = None, eval_workers: int = 1):
     '''
     Scans a directory for text files, executes instances with specified configurations, and saves
     the results in a CSV file.
 
     Args:
       directory (str): represents the path to the directory where the files (instances) are located.
-      config (dict): contains the configuration settings for the algorithm.
+      store (bool): if True, the runs are also appended to the consolidated results store.
+      profile (str): profiler used for each instance, if any. {cprofile, sampling}.
+      profile_top (int): number of functions in the summary of each profile.
+      memory_budget (int): bytes of each chunk of the population evaluated at once.
+      eval_workers (int): number of processes evaluating each generation of the population.
     '''
     with os.scandir(directory) as files:
         ficheros = [file.name for file in files if file.is_file() and file.name.endswith(".txt")]
@@ -140,4 +168,4 @@ def execute_directory(directory: str):
 
     for f in ficheros:
         path = os.path.join(directory, f)
-        execute_instance(path, results)
+        execute_instance(path, results, store, memory_budget, eval_workers, profile, profile_top)
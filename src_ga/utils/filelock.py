@@ -0,0 +1,61 @@
+'''Inter-process file locks and atomic file writes'''
+import contextlib
+import os
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+EXECUTION_LOCK = os.path.join('temp', 'execution.lock')  # Lock of the execution number file
+OUTPUT_LOCK = os.path.join('temp', 'output.lock')  # Lock of the shared output files
+
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    '''
+    Context manager that holds an exclusive lock on the file `path` (created if it does not
+    exist), so the block is run by a single process at a time.
+
+    Args:
+      path (str): path of the lock file.
+    '''
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a+') as file:
+        if os.name == 'nt':
+            file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after 10 seconds
+                    continue
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def atomic_path(path: str):
+    '''
+    Context manager that yields a temporary path, unique for each process, to write a file that
+    replaces `path` once it is completely written, so a file is never left half written nor
+    read while it is written.
+
+    Args:
+      path (str): path of the file.
+    '''
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,170 @@
+'''Profiling of the executions with cProfile or a sampling profiler'''
+import cProfile
+import os
+import pstats
+import signal
+from collections import Counter
+
+from utils.filelock import atomic_path
+from utils.logger import load_logger
+
+logging = load_logger(__name__)
+
+PROFILERS = ['cprofile', 'sampling']
+
+
+class SamplingProfiler:
+    '''Statistical profiler that records the call stack of the main thread every `interval`
+    seconds of CPU time (SIGPROF timer), with a much lower overhead than cProfile. The stacks
+    are counted in the collapsed format read by flamegraph.pl and speedscope. Only available
+    on Unix'''
+    def __init__(self, interval: float = 0.001):
+        '''Initialize SamplingProfiler
+
+        Args:
+          interval (float): seconds of CPU time between samples.
+        '''
+        if not hasattr(signal, 'setitimer'):
+            raise ValueError('The sampling profiler requires a Unix system, use cProfile.')
+        self.interval = interval
+        self.stacks = Counter()  # Number of samples of each collapsed stack
+        self.previous_handler = None
+
+    def enable(self):
+        '''Starts taking samples.'''
+        self.previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def disable(self):
+        '''Stops taking samples.'''
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self.previous_handler or signal.SIG_DFL)
+
+    def _sample(self, signum, frame):
+        '''Records the stack of the interrupted frame, from the outermost call.'''
+        stack = []
+        while frame is not None:
+            stack.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(stack))] += 1
+
+    def summary(self, top: int) -> list:
+        '''
+        Summarizes the samples of the functions with the most samples in their own code.
+
+        Args:
+          top (int): number of functions.
+
+        Returns:
+          (list): function, samples in its own code (`self`) and samples in its calls (`total`).
+        '''
+        own, total = Counter(), Counter()
+        for stack, samples in self.stacks.items():
+            functions = stack.split(';')
+            own[functions[-1]] += samples
+            for function in set(functions):
+                total[function] += samples
+
+        return [{'function': function, 'self': samples, 'total': total[function]}
+                for function, samples in own.most_common(top)]
+
+    def save(self, path: str):
+        '''
+        Saves the collapsed stacks, one `frame;frame;frame samples` line per stack.
+
+        Args:
+          path (str): path of the file.
+        '''
+        with atomic_path(path) as tmp_path:
+            with open(tmp_path, 'w') as file:
+                for stack, samples in sorted(self.stacks.items()):
+                    file.write(f'{stack} {samples}\n')
+
+
+def frame_label(code) -> str:
+    '''Names a frame of a stack as `module:function`, without spaces nor semicolons.'''
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f'{module}:{code.co_name}'.replace(' ', '_').replace(';', '_')
+
+
+def profile_call(function, args: tuple, output_path: str, name: str,
+                 profiler: str = 'cprofile', top: int = 20):
+    '''
+    Calls a function under a profiler, saves its profile in `output_path` and logs the top-N
+    functions. cProfile saves `<name>.prof` (read with pstats, snakeviz or flameprof), and the
+    sampling profiler saves `<name>.collapsed` (flamegraph-ready collapsed stacks). Only the
+    calling process is profiled.
+
+    Args:
+      function (callable): function to be profiled.
+      args (tuple): arguments of the function.
+      output_path (str): directory where the profile is saved.
+      name (str): name of the profile file, without extension.
+      profiler (str): profiler used. {cprofile, sampling}.
+      top (int): number of functions in the summary.
+
+    Returns:
+      The value returned by the function.
+    '''
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler '{profiler}'.")
+
+    os.makedirs(output_path, exist_ok=True)
+    if profiler == 'cprofile':
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            value = function(*args)
+        finally:
+            prof.disable()
+        path = os.path.join(output_path, f'{name}.prof')
+        with atomic_path(path) as tmp_path:
+            prof.dump_stats(tmp_path)
+        rows = cprofile_summary(pstats.Stats(prof), top)
+    else:
+        prof = SamplingProfiler()
+        prof.enable()
+        try:
+            value = function(*args)
+        finally:
+            prof.disable()
+        path = os.path.join(output_path, f'{name}.collapsed')
+        prof.save(path)
+        rows = prof.summary(top)
+
+    log_summary(rows, path)
+
+    return value
+
+
+def cprofile_summary(stats: pstats.Stats, top: int) -> list:
+    '''
+    Summarizes the functions with the highest time spent in their own code.
+
+    Args:
+      stats (pstats.Stats): statistics of a cProfile run.
+      top (int): number of functions.
+
+    Returns:
+      (list): function, number of calls, time in its own code (`tottime`) and time including its
+    calls (`cumtime`) in seconds.
+    '''
+    rows = []
+    for (filename, line, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        module = os.path.splitext(os.path.basename(filename))[0]
+        label = f'{module}:{function}' if line else function
+        rows.append({'function': label, 'ncalls': ncalls, 'tottime': round(tottime, 4),
+                     'cumtime': round(cumtime, 4)})
+    rows.sort(key=lambda row: -row['tottime'])
+
+    return rows[:top]
+
+
+def log_summary(rows: list, path: str):
+    '''Logs the rows of a profile summary as a table.'''
+    columns = list(rows[0]) if rows else []
+    lines = ['  '.join(f'{str(row[c]):>10}' for c in columns[1:]) + f'  {row[columns[0]]}'
+             for row in rows]
+    header = '  '.join(f'{c:>10}' for c in columns[1:]) + '  function'
+    logging.info('Profile saved in %s. Top %s functions:\n%s', path, len(rows),
+                 '\n'.join([header] + lines))
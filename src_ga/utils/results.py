@@ -4,6 +4,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from utils.filelock import EXECUTION_LOCK, OUTPUT_LOCK, atomic_path, file_lock
+from utils.store import ResultStore
+
 
 class OutputHandler:
     '''Class to handle result plotting and saving'''
@@ -32,7 +35,8 @@ class OutputHandler:
 
         return fig
 
-    def save(self, table: pd.DataFrame, secs: float, figure: go.Figure, params: str, instance: str, algo: str):
+    def save(self, table: pd.DataFrame, secs: float, figure: go.Figure, params: str, instance: str, algo: str,
+             store: bool = False):
         '''
         This function saves the solution DataFrame as a CSV and the Figure as an HTML file in a
         specified directory structure that contains the instance name and execution number as ID.
@@ -42,6 +46,7 @@ class OutputHandler:
           figure (go.Figure): figure with solution's Pareto Front plot.
           params (str): parameter configuration used in the optimization algorithm.
           instance (str): represents the name or path of a specific file (instance).
+          store (bool): if True, the run is also appended to the consolidated results store.
         '''
         instance_path = instance.split(os.sep)[1:]
         instance_path = [s.replace('.txt', '') for s in instance_path]
@@ -51,46 +56,54 @@ class OutputHandler:
 
         os.makedirs(output_path, exist_ok=True)
 
-        table.to_csv(os.path.join(output_path,
-                                  f'ref_results_{self.execution_n}.csv'),
-                     index=False)
+        with atomic_path(os.path.join(output_path,
+                                      f'ref_results_{self.execution_n}.csv')) as tmp_path:
+            table.to_csv(tmp_path, index=False)
 
         self._save_execution_time(secs, output_path)
 
+        if store:
+            result_store = ResultStore()
+            result_store.add_run(algo, instance, self.execution_n, table, {'time': secs})
+            result_store.close()
+
         # figure.write_html(os.path.join(output_path,
         #                                f'solution_{self.execution_n}.html'))
 
     def _get_execution_number(self):
         '''
         The function reads an execution number from a file, increments it by 1, and writes the
-        updated number back to the file.
+        updated number back to the file. The counter is shared by every campaign writing to the
+        same output tree and it is never reset, so an execution number is never reused.
         '''
         execution_file = os.path.join('temp', 'execution.txt')
 
-        if os.path.exists(execution_file):
-            with open(execution_file, 'r+') as file:
-                self.execution_n = file.read()
-                file.seek(0)
-                file.write(str(int(self.execution_n) + 1))
-                file.truncate()
-        else:
-            self.execution_n = 1
-            os.makedirs('temp', exist_ok=True)
-            with open(execution_file, 'w') as file:
-                file.write(str(int(self.execution_n) + 1))
+        # The file is locked so concurrent runs never get the same execution number
+        with file_lock(EXECUTION_LOCK):
+            if os.path.exists(execution_file):
+                with open(execution_file, 'r') as file:
+                    self.execution_n = int(file.read())
+            else:
+                self.execution_n = 1
+            with atomic_path(execution_file) as tmp_path:
+                with open(tmp_path, 'w') as file:
+                    file.write(str(self.execution_n + 1))
 
     def _save_execution_time(self, secs: float, path: str):
         '''
-        The function saves algorithm's execution time `secs` in seconds in a csv file.
+        The function saves algorithm's execution time `secs` in seconds in a csv file. The file is
+        shared by all the executions, so it is read, updated and replaced holding a lock.
         '''
         time_file = os.path.join(path, 'ex_times.csv')
-        if os.path.exists(time_file):
-            time_table = pd.read_csv(time_file)
-            time_table = time_table.append(
-                pd.DataFrame({'ex_number': [self.execution_n],
-                              'time': [secs]}))
-        else:
-            time_table = pd.DataFrame({'ex_number': [self.execution_n],
-                                       'time': [secs]})
-
-        time_table.to_csv(time_file, index=False)
+        with file_lock(OUTPUT_LOCK):
+            if os.path.exists(time_file):
+                time_table = pd.read_csv(time_file)
+                time_table = time_table.append(
+                    pd.DataFrame({'ex_number': [self.execution_n],
+                                  'time': [secs]}))
+            else:
+                time_table = pd.DataFrame({'ex_number': [self.execution_n],
+                                           'time': [secs]})
+
+            with atomic_path(time_file) as tmp_path:
+                time_table.to_csv(tmp_path, index=False)
@@ -0,0 +1,93 @@
+'''Parallel scheduler of the (instance, experiment) executions of a campaign'''
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils import execution
+from utils.results import OutputHandler
+from utils.logger import load_logger
+
+logging = load_logger(__name__)
+
+
+def create_tasks(directory: str, experiments: int, store: bool = False, profile: str = None,
+                 profile_top: int = 20, memory_budget: int = None, eval_workers: int = 1) -> list:
+    '''
+    Expands the grid of instances in `directory` and experiments into a list of tasks sorted from
+    the largest to the smallest instance, so the longest tasks are started first and the total
+    execution time (makespan) is minimized. The execution numbers are assigned in the same order
+    as in the sequential execution.
+
+    Args:
+      directory (str): represents the path to the directory where the files (instances) are located.
+      experiments (int): number of experiments/executions per instance.
+      store (bool): if True, the runs are also appended to the consolidated results store.
+      profile (str): profiler used for each instance, if any. {cprofile, sampling}.
+      profile_top (int): number of functions in the summary of each profile.
+      memory_budget (int): bytes of each chunk of the population evaluated at once.
+      eval_workers (int): number of processes evaluating each generation of the population.
+
+    Returns:
+      (list): tasks, each one represented as a dict with the instance `path`, the `results`
+    OutputHandler with the execution number, the instance `size`, the `store` flag, the
+    `profile` settings and the `evaluation` settings (memory budget and processes).
+    '''
+    with os.scandir(directory) as files:
+        ficheros = [file.name for file in files if file.is_file() and file.name.endswith(".txt")]
+
+    tasks = []
+    for n in range(experiments):
+        results = OutputHandler()
+        for f in ficheros:
+            path = os.path.join(directory, f)
+            tasks.append({'path': path,
+                          'results': results,
+                          'size': get_instance_size(path),
+                          'store': store,
+                          'profile': (profile, profile_top),
+                          'evaluation': (memory_budget, eval_workers)})
+
+    tasks.sort(key=lambda task: -task['size'])
+
+    return tasks
+
+
+def execute_tasks(tasks: list, workers: int):
+    '''
+    Executes the tasks in a pool of `workers` processes in the given order.
+
+    Args:
+      tasks (list): tasks created with `create_tasks`.
+      workers (int): number of worker processes.
+    '''
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(execute_task, task): task for task in tasks}
+        for count, future in enumerate(as_completed(futures)):
+            task = futures[future]
+            future.result()
+            logging.info('Finished task %s/%s: %s (execution %s).',
+                         count + 1, len(tasks), task['path'], task['results'].execution_n)
+
+
+def execute_task(task: dict):
+    '''
+    Solves the instance of a task with the GA algorithms.
+
+    Args:
+      task (dict): task created with `create_tasks`.
+    '''
+    execution.execute_instance(task['path'], task['results'], task['store'], *task['evaluation'],
+                               *task['profile'])
+
+
+def get_instance_size(path: str) -> int:
+    '''
+    Reads the number of nodes of an instance from the first line of its file.
+
+    Args:
+      path (str): file path to the instance.
+
+    Returns:
+      (int): number of nodes of the instance.
+    '''
+    with open(path, 'r') as f:
+        return int(f.readline())
@@ -0,0 +1,52 @@
+'''Tests of the campaign manifests and checkpoints'''
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils import checkpoint  # noqa: E402
+
+
+def start_execution(manifest: checkpoint.CampaignManifest, params: str, instance: str) -> str:
+    '''Allocates the execution of the first experiment and saves a checkpoint of it.'''
+    results = manifest.create_output_handler(params, 0)
+    path = checkpoint.get_checkpoint_path(params, instance, results.execution_n)
+    checkpoint.save_checkpoint(path, {'completed': set()})
+    return path
+
+
+def test_campaign_key():
+    '''The key depends on the instance directory and the configurations, not on their order.'''
+    key = checkpoint.get_campaign_key(os.path.join('instances', 'GDP', 'A'), ['IT10', 'IT20'])
+    assert key == checkpoint.get_campaign_key(os.path.join('instances', 'GDP', 'A', ''),
+                                              ['IT20', 'IT10'])
+    assert key != checkpoint.get_campaign_key(os.path.join('instances', 'GDP', 'B'),
+                                              ['IT10', 'IT20'])
+
+
+def test_manifests_coexist(tmp_path, monkeypatch):
+    '''Starting a campaign does not remove the manifest nor the checkpoints of another one.'''
+    monkeypatch.chdir(tmp_path)
+    instance = os.path.join('instances', 'GDP', 'A', 't_n30.txt')
+
+    first = checkpoint.CampaignManifest(key='first')
+    first_checkpoint = start_execution(first, 'IT10', instance)
+    first.complete('IT10', os.path.join('instances', 'GDP', 'A', 't_n60.txt'), 0)
+
+    second = checkpoint.CampaignManifest(key='second')
+    second_checkpoint = start_execution(second, 'IT10', instance)
+
+    # Both campaigns keep their manifest and checkpoint, with different execution numbers
+    assert first_checkpoint != second_checkpoint
+    assert os.path.exists(first_checkpoint) and os.path.exists(second_checkpoint)
+    resumed = checkpoint.CampaignManifest(resume=True, key='first')
+    assert resumed.is_completed('IT10', os.path.join('instances', 'GDP', 'A', 't_n60.txt'), 0)
+    assert (resumed.create_output_handler('IT10', 0).execution_n
+            == first.create_output_handler('IT10', 0).execution_n)
+
+    # A new run of the first campaign only removes its own manifest and checkpoints
+    restarted = checkpoint.CampaignManifest(key='first')
+    assert len(restarted.completed) == 0
+    assert not os.path.exists(first_checkpoint)
+    assert os.path.exists(second_checkpoint)
+    assert os.path.exists(checkpoint.get_manifest_path('second'))
@@ -0,0 +1,58 @@
+'''Tests of the evaluation of the output tree of the algorithms'''
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+EVALUATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'evaluation')
+
+SCRIPT = '''
+import sys
+sys.path.insert(0, {evaluation_dir!r})
+import utils
+instances = utils.get_coincident_instances('output', 'GDP', 'SUB')
+print(utils.list_algorithms('output'), sorted(instances))
+utils.plot_pareto_fronts('output', 'GDP', 'SUB', instances)
+utils.calculate_performance_indicators('output', 'GDP', 'SUB', instances)
+'''
+
+
+def write_results(instance_path: str, solutions: list):
+    '''Writes the results and execution time of an execution as saved by the GA.'''
+    os.makedirs(instance_path, exist_ok=True)
+    pd.DataFrame(solutions, columns=['Solution', 'MaxSum', 'MaxMin', 'Cost', 'Capacity']) \
+        .to_csv(os.path.join(instance_path, 'ref_results_1.csv'), index=False)
+    pd.DataFrame({'ex_number': [1], 'time': [1.5]}) \
+        .to_csv(os.path.join(instance_path, 'ex_times.csv'), index=False)
+
+
+def write_profile(instance_path: str):
+    '''Writes a (fake) profile file of an execution.'''
+    os.makedirs(instance_path, exist_ok=True)
+    with open(os.path.join(instance_path, 'profile_1.prof'), 'wb') as file:
+        file.write(b'profile')
+
+
+def test_evaluation_with_profiles(tmp_path):
+    '''The directories with profiles only (e.g. of a previous GA version) are not algorithms, and
+    the profiles next to the results are ignored.'''
+    output = tmp_path / 'output'
+    write_results(str(output / 'NSGA2' / 'GDP' / 'SUB' / 't_n30'),
+                  [['1 - 2 - 3', 300.0, 40.0, 10, 20], ['1 - 4', 100.0, 100.0, 5, 15]])
+    write_results(str(output / 'SPEA2' / 'GDP' / 'SUB' / 't_n30'),
+                  [['2 - 3 - 5', 320.0, 30.0, 12, 22]])
+    for algorithm in ('NSGA2', 'SPEA2', 'NSGA2-SPEA2'):
+        write_profile(str(output / algorithm / 'GDP' / 'SUB' / 't_n30'))
+    # Instance with a profile but without results
+    write_profile(str(output / 'NSGA2' / 'GDP' / 'SUB' / 't_n60'))
+
+    process = subprocess.run([sys.executable, '-c',
+                              SCRIPT.format(evaluation_dir=EVALUATION_DIR)],
+                             cwd=tmp_path, capture_output=True, text=True)
+
+    assert process.returncode == 0, process.stderr
+    assert "['NSGA2', 'SPEA2'] ['t_n30']" in process.stdout
+    indicators = pd.read_csv(output / 'indicators.csv')
+    assert sorted(indicators.alg_config) == ['NSGA2', 'SPEA2']
+    assert (output / 'fig.html').exists()
@@ -0,0 +1,45 @@
+'''Tests of the phase times recorded by the instrumentation'''
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils import instrumentation  # noqa: E402
+from utils.results import OutputHandler  # noqa: E402
+
+
+def test_merge_worker_phases():
+    '''The phases of the workers are kept apart from the ones of the main process.'''
+    instrumentation.reset()
+    instrumentation.TIMES['construction'] = 1.0
+    instrumentation.CALLS['construction'] = 1
+    worker = {'times': {'construction': 2.0}, 'calls': {'construction': 3},
+              'counters': {'local_searches': 4}}
+    instrumentation.merge(worker, prefix='workers_')
+    instrumentation.merge(worker, prefix='workers_')
+
+    phases = instrumentation.phases()
+    assert phases['construction'] == {'time': 1.0, 'calls': 1}
+    assert phases['workers_construction'] == {'time': 4.0, 'calls': 6}
+    assert instrumentation.COUNTERS == {'local_searches': 8}
+    instrumentation.reset()
+
+
+def test_output_writing_in_add_data(tmp_path, monkeypatch):
+    '''The time of writing the results is saved with the rest of the phases.'''
+    monkeypatch.chdir(tmp_path)
+    instrumentation.enable()
+    instrumentation.reset()
+    add_data = {'time': [1.0]}
+    try:
+        OutputHandler(1).save([], None, None, add_data, 'IT10',
+                              os.path.join('instances', 'GDP', 'A', 't_n30.txt'))
+    finally:
+        instrumentation.enable(False)
+        instrumentation.reset()
+
+    assert 'output_writing_time' in add_data
+    output_path = OutputHandler.get_output_path('IT10', os.path.join('instances', 'GDP', 'A',
+                                                                     't_n30.txt'))
+    with open(os.path.join(output_path, 'add_data.csv')) as file:
+        assert 'output_writing_time' in file.readline()